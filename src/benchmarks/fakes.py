@@ -0,0 +1,342 @@
+# Dobles en memoria para los benchmarks: un cliente de Supabase con latencia
+# inyectada y objetos Interaction/Context con lo que usan los comandos.
+import time
+import random
+import asyncio
+import threading
+import itertools
+from datetime import datetime, timezone, date as Date, timedelta
+
+# --- SUPABASE ---
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+class _RequestInfo:
+    # Lo mismo que mira utils.metrics.query_labels en el builder real
+    def __init__(self, path, http_method):
+        self.path = path
+        self.http_method = http_method
+
+class FakeQuery:
+    """Subconjunto del builder de postgrest que usa utils/repository.py."""
+
+    def __init__(self, db, table):
+        self._db = db
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._payload = None
+        self._filters = []
+        self._order = None
+        self._limit = None
+        self._single = False
+        self._on_conflict = None
+        self._ignore_duplicates = False
+        self.request = _RequestInfo(f"http://fake/rest/v1/{table}", "GET")
+
+    def _set(self, op, method, payload=None):
+        self._op = op
+        self._payload = payload
+        self.request.http_method = method
+        return self
+
+    def select(self, columns="*"):
+        self._columns = columns
+        return self
+
+    def insert(self, rows):
+        return self._set("insert", "POST", rows)
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self._on_conflict = on_conflict
+        self._ignore_duplicates = ignore_duplicates
+        return self._set("upsert", "POST", rows)
+
+    def update(self, values):
+        return self._set("update", "PATCH", values)
+
+    def delete(self):
+        return self._set("delete", "DELETE")
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and str(row[column]) >= str(value))
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def maybe_single(self):
+        self._single = True
+        return self
+
+    def execute(self):
+        self._db.wait()
+        with self._db.lock:
+            data = getattr(self, f"_run_{self._op}")()
+        if self._single:
+            # Igual que postgrest: sin fila no hay respuesta, no un error
+            return FakeResponse(data[0]) if data else None
+        return FakeResponse(data)
+
+    def _matches(self):
+        return [r for r in self._db.tables.setdefault(self._table, []) if all(f(r) for f in self._filters)]
+
+    def _run_select(self):
+        rows = [self._db.embed(self._table, dict(r), self._columns) for r in self._matches()]
+        if self._order:
+            column, desc = self._order
+            rows.sort(key=lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else 0),
+                      reverse=desc)
+        # Como PostgREST: nunca más de max-rows filas por respuesta
+        limit = min(self._limit or self._db.max_rows, self._db.max_rows)
+        return rows[:limit]
+
+    def _run_insert(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        return [self._db.insert(self._table, row) for row in rows]
+
+    def _run_upsert(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        table = self._db.tables.setdefault(self._table, [])
+        result = []
+        for row in rows:
+            key = self._on_conflict or "id"
+            current = next((r for r in table if r.get(key) == row.get(key)), None)
+            if current is None:
+                result.append(self._db.insert(self._table, row))
+            elif not self._ignore_duplicates:
+                current.update(row, updated_at=self._db.now())
+                result.append(dict(current))
+        return result
+
+    def _run_update(self):
+        rows = self._matches()
+        for row in rows:
+            row.update(self._payload, updated_at=self._db.now())
+        return [dict(r) for r in rows]
+
+    def _run_delete(self):
+        rows = self._matches()
+        table = self._db.tables[self._table]
+        for row in rows:
+            table.remove(row)
+        return [dict(r) for r in rows]
+
+class FakeRPC:
+    def __init__(self, db, name, params):
+        self._db = db
+        self._name = name
+        self._params = params
+        self.request = _RequestInfo(f"http://fake/rest/v1/rpc/{name}", "POST")
+
+    def execute(self):
+        self._db.wait()
+        with self._db.lock:
+            return FakeResponse(self._db.functions[self._name](self._db, **self._params))
+
+def record_unitedle_stats(db, user_id, date, attempt, won):
+    """Misma lógica que record_unitedle_stats en supabase/migrations/*_unitedle_stats.sql."""
+    rows = db.tables.setdefault("unitedle_stats", [])
+    s = next((r for r in rows if r["user_id"] == user_id), None)
+    if s is None:
+        db.insert("unitedle_stats", {"user_id": user_id, "played": 0, "wins": 0, "current_streak": 0,
+                                     "best_streak": 0, "last_played_date": None, "last_win_date": None,
+                                     "histogram": {}})
+        s = rows[-1]
+    if s["last_played_date"] != date:
+        s["played"] += 1
+        s["last_played_date"] = date
+    if won and s["last_win_date"] != date:
+        yesterday = (Date.fromisoformat(date) - timedelta(days=1)).isoformat()
+        s["current_streak"] = s["current_streak"] + 1 if s["last_win_date"] == yesterday else 1
+        s["best_streak"] = max(s["best_streak"], s["current_streak"])
+        s["last_win_date"] = date
+        s["wins"] += 1
+        s["histogram"] = {**s["histogram"], str(attempt): s["histogram"].get(str(attempt), 0) + 1}
+    s["updated_at"] = db.now()
+    return dict(s)
+
+def submit_unitedle_guess(db, p_user_id, p_date, p_guess, p_target, p_feedback):
+    """Misma lógica que supabase/migrations/*_submit_unitedle_guess.sql (con stats de *_unitedle_stats.sql)."""
+    attempts = [r for r in db.tables.setdefault("user_attempts", [])
+                if r["user_id"] == p_user_id and r["date"] == p_date]
+    last = max((r["attempt_number"] for r in attempts), default=0)
+    if any(r["guess"] == p_target for r in attempts):
+        return [{"attempt_number": last, "won": True, "already_won": True, "hint_level": min(last // 3, 3),
+                 "stats": None}]
+    attempt = last + 1
+    won = p_guess == p_target
+    db.insert("user_attempts", {
+        "user_id": p_user_id, "date": p_date, "attempt_number": attempt,
+        "guess": p_guess, "result_json": p_feedback,
+    })
+    return [{"attempt_number": attempt, "won": won, "already_won": False,
+             "hint_level": min(attempt // 3, 3), "stats": record_unitedle_stats(db, p_user_id, p_date, attempt, won)}]
+
+class FakeSupabase:
+    """Cliente falso: tablas en listas de dicts y `latency` (+ `jitter`) segundos por execute().
+
+    Los select devuelven como mucho `max_rows` filas, igual que PostgREST en Supabase.
+
+    La espera es un time.sleep en el hilo del pool, igual que la llamada HTTP
+    bloqueante del cliente real.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, seed=None, max_rows=1000):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rows = max_rows
+        self.tables = {}
+        # tabla embebida -> (columna local, columna remota), para select("*, pokemon_unite(*)")
+        self.relations = {"pokemon_unite": ("pokemon_id", "id")}
+        self.functions = {"submit_unitedle_guess": submit_unitedle_guess}
+        self.lock = threading.Lock()
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._rng = random.Random(seed)
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRPC(self, name, params)
+
+    def wait(self):
+        self.calls += 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+    def now(self):
+        return datetime.now(timezone.utc).isoformat()
+
+    def insert(self, table, row):
+        row = dict(row)
+        row.setdefault("id", next(self._ids))
+        row.setdefault("updated_at", self.now())
+        self.tables.setdefault(table, []).append(row)
+        return dict(row)
+
+    def embed(self, table, row, columns):
+        for name, (local, remote) in self.relations.items():
+            if f"{name}(" in columns:
+                row[name] = next((dict(r) for r in self.tables.get(name, []) if r.get(remote) == row.get(local)), None)
+        return row
+
+# --- DISCORD ---
+class FakeUser:
+    def __init__(self, user_id, name=None):
+        self.id = user_id
+        self.name = name or f"user{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+class FakeMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel, content=None, **kwargs):
+        self.id = next(FakeMessage._ids)
+        self.channel = channel
+        self.guild = None
+        self.content = content
+        self.kwargs = kwargs
+
+    async def edit(self, **kwargs):
+        self.kwargs.update(kwargs)
+        return self
+
+class FakeChannel:
+    def __init__(self, channel_id=1):
+        self.id = channel_id
+        self.sent = 0
+
+    async def send(self, content=None, **kwargs):
+        self.sent += 1
+        return FakeMessage(self, content, **kwargs)
+
+    def get_partial_message(self, message_id):
+        return FakeMessage(self)
+
+class FakeInteractionResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self):
+        if self._done:
+            raise RuntimeError("La interacción ya fue respondida")
+        self._done = True
+        self._interaction.acked_at = time.perf_counter()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond()
+
+    async def edit_message(self, **kwargs):
+        await self._respond()
+
+    async def defer(self, **kwargs):
+        await self._respond()
+
+class FakeInteraction:
+    """Lo que usan los comandos y vistas de este bot de discord.Interaction."""
+
+    def __init__(self, user, channel, message=None, data=None):
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id
+        self.guild = None
+        self.guild_id = None
+        self.message = message
+        self.data = data or {}
+        self.extras = {}
+        self.command = None
+        self.created = time.perf_counter()
+        self.acked_at = None
+        self.response = FakeInteractionResponse(self)
+
+    async def edit_original_response(self, **kwargs):
+        return self.message
+
+class FakeContext:
+    """commands.Context mínimo para invocar el callback de un comando híbrido como prefijo."""
+
+    def __init__(self, author, channel):
+        self.author = author
+        self.channel = channel
+        self.guild = None
+        self.interaction = None
+        self.message = FakeMessage(channel)
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+    async def defer(self, **kwargs):
+        pass
+
+class FakeBot:
+    """Lo que los cogs piden al bot en su __init__ y loops."""
+
+    def __init__(self):
+        self.cog_state = {}
+        self.emojis = []
+
+    async def wait_until_ready(self):
+        await asyncio.Event().wait()
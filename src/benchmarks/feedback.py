@@ -0,0 +1,40 @@
+# Benchmark: matriz de feedback vs generate_feedback por llamada.
+# Uso (desde src/): python -m benchmarks.feedback
+import random
+import time
+from utils.roster import RosterIndex
+from utils.feedback import FeedbackMatrix, generate_feedback
+
+def naive_candidates(names, attempts):
+    return [t for t in names if all(generate_feedback(g, t) == f for g, f in attempts)]
+
+def bench(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / repeat * 1e6:>10.1f} µs/op")
+    return elapsed / repeat
+
+def main(repeat=2000, seed=7):
+    rng = random.Random(seed)
+    names = [n.upper() for n in RosterIndex.from_json().names]
+
+    start = time.perf_counter()
+    matrix = FeedbackMatrix(names)
+    print(f"Matriz {matrix.matrix.shape} ({matrix.matrix.nbytes} bytes, "
+          f"{len(matrix.patterns)} patrones) construida en {(time.perf_counter() - start) * 1e3:.1f} ms\n")
+
+    target = rng.choice(names)
+    attempts = [(g, generate_feedback(g, target)) for g in rng.sample(names, 4)]
+    assert [names[i] for i in matrix.candidates(attempts)] == naive_candidates(names, attempts)
+
+    guess = rng.choice(names)
+    bench("feedback (generate_feedback)", lambda: generate_feedback(guess, target), repeat * 10)
+    bench("feedback (matriz)", lambda: matrix.feedback(guess, target), repeat * 10)
+    naive = bench("candidatos (generate_feedback)", lambda: naive_candidates(names, attempts), repeat)
+    fast = bench("candidatos (matriz)", lambda: matrix.candidates(attempts), repeat)
+    print(f"\nSpeedup candidatos: {naive / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
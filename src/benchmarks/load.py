@@ -0,0 +1,235 @@
+# Benchmark de carga: N usuarios concurrentes contra los callbacks reales de
+# los comandos y vistas, con Supabase y Discord falsos (todo offline).
+# Uso (desde src/): python -m benchmarks.load --users 50 --rounds 10 --latency 0.05
+#   --only unitedle.play,flip7.click   solo esos escenarios
+#   --json resultado.json              guarda los números
+#   --compare base.json                compara p99 contra una corrida anterior
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from benchmarks.fakes import FakeSupabase, FakeUser, FakeChannel, FakeMessage, FakeInteraction, FakeContext, FakeBot
+from utils import database
+from utils import repository
+from utils.metrics import metrics
+from utils.roster import RosterIndex
+from utils.watchlist_store import watchlist
+from cogs.unitedle import Unitedle, current_date
+from cogs.watchlist import Watchlist
+from classes.flip7 import MultiFlip7View
+from classes.watchlist import WatchlistView
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+# --- DATOS ---
+def seed(db, anime_count, rng):
+    today = current_date()  # El mismo reloj que /unitedle play
+    names = RosterIndex.from_json().names
+    for i, name in enumerate(names, start=1):
+        db.insert("pokemon_unite", {
+            "id": i, "name": name, "role": rng.choice(["Attacker", "Defender", "Speedster", "Supporter", "All-Rounder"]),
+            "evolves": rng.random() < 0.5, "has_mega": rng.random() < 0.1, "image_url": f"https://fake/{i}.png",
+        })
+    target = rng.randrange(1, len(names) + 1)
+    db.insert("daily_pokemon", {"date": today, "pokemon_id": target})
+    for i in range(anime_count):
+        db.insert("watchlist", {"title": f"Anime semilla {i}", "added_by": "bench", "status": i % 3 == 0})
+    return names
+
+# --- ESCENARIOS ---
+# Cada escenario es una coroutine (env, usuario, n) que ejecuta una operación.
+async def unitedle_play(env, user, n):
+    interaction = FakeInteraction(user, env.channel)
+    await env.unitedle.unitedle.callback(env.unitedle, interaction, guess=env.rng.choice(env.names))
+    return interaction
+
+async def unitedle_candidates(env, user, n):
+    interaction = FakeInteraction(user, env.channel)
+    await env.unitedle.candidates.callback(env.unitedle, interaction)
+    return interaction
+
+async def unitedle_stats(env, user, n):
+    interaction = FakeInteraction(user, env.channel)
+    await env.unitedle.stats_command.callback(env.unitedle, interaction)
+    return interaction
+
+async def watchlist_add(env, user, n):
+    await env.watchlist.add.callback(env.watchlist, FakeContext(user, env.channel), titulo=f"Anime {user.id}-{n}")
+
+async def watchlist_list(env, user, n):
+    await env.watchlist.pendientes.callback(env.watchlist, FakeContext(user, env.channel))
+
+async def watchlist_next(env, user, n):
+    # Una vista por usuario; al llegar al final vuelve a empezar
+    view = env.views.get(user.id)
+    if view is None or view.current_page >= view.total_pages - 1:
+        view = env.views[user.id] = WatchlistView(watchlist, False, "Pendientes")
+        view.render()
+    interaction = FakeInteraction(user, env.channel, message=FakeMessage(env.channel))
+    await view.next.callback(interaction)
+    return interaction
+
+async def watchlist_watched(env, user, n):
+    pendientes = watchlist.list(False)
+    if pendientes:
+        titulo = env.rng.choice(pendientes)['title']
+        await env.watchlist.visto.callback(env.watchlist, FakeContext(user, env.channel), titulo=titulo)
+
+async def watchlist_export(env, user, n):
+    await env.watchlist.exportar.callback(env.watchlist, FakeContext(user, env.channel), formato="csv")
+
+async def flip7_click(env, user, n):
+    # Partida individual por usuario: flip hasta 4 cartas y luego stay
+    view = env.games.get(user.id)
+    if view is None or view.game.finished:
+        view = env.games[user.id] = MultiFlip7View([user], seed=env.rng.random())
+        view.render()
+    interaction = FakeInteraction(user, env.channel, message=FakeMessage(env.channel))
+    button = view.stay if len(view.game.current_hand) >= 4 else view.flip
+    await button.callback(interaction)
+    return interaction
+
+SCENARIOS = {
+    "unitedle.play": unitedle_play,
+    "unitedle.candidates": unitedle_candidates,
+    "unitedle.stats": unitedle_stats,
+    "watchlist.add": watchlist_add,
+    "watchlist.list": watchlist_list,
+    "watchlist.next": watchlist_next,
+    "watchlist.watched": watchlist_watched,
+    "watchlist.export": watchlist_export,
+    "flip7.click": flip7_click,
+}
+
+class Env:
+    def __init__(self, db, names, unitedle, watchlist_cog, channel, rng):
+        self.db = db
+        self.names = names
+        self.unitedle = unitedle
+        self.watchlist = watchlist_cog
+        self.channel = channel
+        self.rng = rng
+        self.views = {}
+        self.games = {}
+
+async def run_scenario(env, name, users, rounds):
+    scenario = SCENARIOS[name]
+    latencies, acks, errors = [], [], 0
+
+    async def user_loop(user):
+        nonlocal errors
+        for n in range(rounds):
+            start = time.perf_counter()
+            try:
+                interaction = await scenario(env, user, n)
+            except Exception as e:
+                errors += 1
+                if errors == 1:
+                    print(f"❌ {name}: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            latencies.append(time.perf_counter() - start)
+            if interaction is not None and interaction.acked_at is not None:
+                acks.append(interaction.acked_at - start)
+
+    calls_before = env.db.calls
+    start = time.perf_counter()
+    await asyncio.gather(*(user_loop(FakeUser(10_000 + i)) for i in range(users)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    acks.sort()
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        "ack_p99_ms": percentile(acks, 0.99) * 1000 if acks else None,
+        "db_calls": env.db.calls - calls_before,
+    }
+
+def print_table(results, baseline=None, threshold=0.2):
+    header = f"{'escenario':<22}{'ops':>7}{'err':>5}{'ops/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'ack p99':>9}{'db/op':>7}"
+    print(header)
+    print("-" * len(header))
+    regressions = []
+    for name, r in results.items():
+        ack = f"{r['ack_p99_ms']:.1f}" if r['ack_p99_ms'] is not None else "—"
+        db_per_op = r['db_calls'] / r['ops'] if r['ops'] else 0
+        line = (f"{name:<22}{r['ops']:>7}{r['errors']:>5}{r['throughput']:>10.1f}"
+                f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}{ack:>9}{db_per_op:>7.2f}")
+        base = (baseline or {}).get(name)
+        if base and base["p99_ms"]:
+            delta = r["p99_ms"] / base["p99_ms"] - 1
+            line += f"  p99 {delta:+.0%}"
+            if delta > threshold:
+                line += " ⚠️"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+async def main(args):
+    rng = random.Random(args.seed)
+    db = FakeSupabase(latency=args.latency, jitter=args.jitter, seed=args.seed)
+    database.set_client(db)
+    metrics.slow_call_ms = float("inf")  # Sin logs de llamadas lentas durante la carga
+
+    names = seed(db, args.anime, rng)
+    bot = FakeBot()
+    unitedle = Unitedle(bot, repository)
+    await unitedle.stats.load()
+    unitedle.feedback  # La matriz se arma antes de medir, como hace warm_feedback en producción
+    await watchlist.load()
+    env = Env(db, names, unitedle, Watchlist(bot), FakeChannel(), rng)
+
+    selected = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [s for s in selected if s not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Escenarios desconocidos: {', '.join(unknown)}. Opciones: {', '.join(SCENARIOS)}")
+
+    print(f"{args.users} usuarios × {args.rounds} rondas, latencia DB {args.latency * 1000:.0f} ms "
+          f"(+{args.jitter * 1000:.0f} jitter), pool DB {repository.DB_MAX_CONCURRENCY}\n")
+    results = {}
+    for name in selected:
+        results[name] = await run_scenario(env, name, args.users, args.rounds)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = print_table(results, baseline, args.max_regression)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    if regressions:
+        print(f"\n⚠️ p99 empeoró más de {args.max_regression:.0%} en: {', '.join(regressions)}")
+        return 1
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Carga concurrente sobre los comandos del bot, sin red.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10, help="Operaciones por usuario y escenario")
+    parser.add_argument("--latency", type=float, default=0.03, help="Segundos por llamada a la DB falsa")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--anime", type=int, default=500, help="Filas iniciales en el watchlist")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", help="Escenarios separados por coma")
+    parser.add_argument("--json", help="Guarda los resultados en este archivo")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para comparar p99")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Tolerancia de p99 antes de fallar (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    # os._exit: los loops de los cogs y el pool de la DB no deben colgar la salida
+    code = asyncio.run(main(parse_args()))
+    sys.stdout.flush()
+    os._exit(code)
@@ -1,41 +1,149 @@
-from discord.ext import tasks
+import time
+ARRANQUE = time.perf_counter()
+
 import os
+from dotenv import load_dotenv
+
+# Una sola vez y antes de importar los módulos que leen variables de entorno al cargarse
+load_dotenv()
+
+# Antes de los demás imports para que el reporte de memoria también los cuente
+from utils import memory
+memory.start_from_env()
+
+from discord.ext import tasks
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.database import supabase
-from dotenv import load_dotenv
-from classes.flip7 import *
-from classes.watchlist import WatchlistView, VistoView, DeleteView
+from utils import repository
+from utils.sessions import sessions
+from utils.startup import PhaseTimer, sync_if_changed
+from utils.gateway import GATEWAY_MODE, client_options
+from utils.metrics import metrics, InstrumentedTree, interaction_trace_config, observe_interaction
+from utils.render import reply_unavailable
+from utils.hot_reload import EXTENSIONS, HOT_RELOAD, HOT_RELOAD_INTERVAL, FileWatcher, resolve_extension, reload_extension
+import signal
 import asyncio
 import random
 from utils import emotes
 
-# Configuración de Supabase
-load_dotenv()
+startup = PhaseTimer(ARRANQUE)
+startup.mark("imports", ARRANQUE)
+
 TOKEN = os.getenv("DISCORD_TOKEN")
-URL = os.getenv("SUPABASE_URL")
-KEY = os.getenv("SUPABASE_KEY")
 admin_id = int(os.getenv("ADMIN_ID"))
+DB_HEALTH_INTERVAL = float(os.getenv("DB_HEALTH_INTERVAL", "30"))
+
+class PascualkyuTree(InstrumentedTree):
+    async def on_error(self, interaction, error, /):
+        if repository.is_unavailable(error):
+            # Supabase caído: mensaje amable en vez de "La aplicación no respondió"
+            observe_interaction(interaction, ok=False)
+            await reply_unavailable(interaction)
+            return
+        await super().on_error(interaction, error)
 
 class Pascualkyu(commands.Bot):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        super().__init__(command_prefix="p!", intents=intents)
+        super().__init__(command_prefix="p!", tree_cls=PascualkyuTree,
+                         http_trace=interaction_trace_config(), **client_options())
+        self.cog_state = {}  # Estado que un cog le pasa a su versión recargada
 
     async def setup_hook(self):
-        await self.load_extension('cogs.unitedle')
-        print("✅ Módulo Unitedle cargado.")
-        await self.tree.sync()
+        # docker-compose down manda SIGTERM: cerramos ordenadamente para guardar las partidas
+        try:
+            self.loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(self.close()))
+        except NotImplementedError:
+            pass
+
+        for ext in EXTENSIONS:
+            with startup.phase(ext):
+                await self.load_extension(ext)
+            print(f"✅ Módulo {ext} cargado.")
+        with startup.phase("sync comandos"):
+            try:
+                synced = await sync_if_changed(self.tree, self.application_id)
+                if synced is None:
+                    print("✅ Comandos sin cambios, no se sincronizan.")
+                else:
+                    print(f"✅ {len(synced)} comandos sincronizados.")
+            except Exception as e:
+                print(f"❌ Error al sincronizar los comandos: {e}")
+        metrics.start()
+        try:
+            await metrics.serve()
+        except OSError as e:
+            print(f"❌ No pude abrir el endpoint de métricas: {e}")
+        self._gateway_start = time.perf_counter()
+
+    async def close(self):
+        try:
+            guardadas = sessions.save_snapshot()
+            print(f"💾 {guardadas} partidas guardadas antes de apagar.")
+        except Exception as e:
+            print(f"❌ Error al guardar las partidas: {e}")
+        await metrics.close()
+        await super().close()
+
+    async def invoke(self, ctx):
+        # Solo comandos con prefijo: los slash (también híbridos) los mide InstrumentedTree
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        start = time.perf_counter()
+        try:
+            await super().invoke(ctx)
+        finally:
+            metrics.observe_command(ctx.command.qualified_name, time.perf_counter() - start, not ctx.command_failed)
+
+    async def on_app_command_completion(self, interaction, command):
+        observe_interaction(interaction, ok=True)
+
+    async def on_command_error(self, ctx, error):
+        if ctx.interaction is not None:  # Híbrido invocado como slash: el árbol no ve el error
+            observe_interaction(ctx.interaction, ok=False)
+        if repository.is_unavailable(error):
+            try:
+                await ctx.send(repository.UNAVAILABLE_MESSAGE, ephemeral=True)
+            except discord.HTTPException:
+                pass
+            return
+        await super().on_command_error(ctx, error)
 
 bot = Pascualkyu()
 
 @bot.event
 async def on_ready():
-    keep_alive.start()
-    emotes.setup_emotes(bot)
-    print(f"✅ Bot conectado como {bot.user} y emotes cargados.")
+    # on_ready se repite en cada reconexión; el desglose solo se imprime la primera vez
+    first = not health_probe.is_running()
+    if first:
+        startup.mark("gateway", bot._gateway_start)
+        health_probe.start()
+        if HOT_RELOAD:
+            watch_cogs.start(FileWatcher())
+        # Después los mantienen al día los eventos de servidor de abajo, sin recorrer bot.emojis
+        inicio = time.perf_counter()
+        emotes.setup_emotes(bot)
+        startup.mark("emotes", inicio)
+    print(f"✅ Bot conectado como {bot.user} y {len(emotes.registry)} emotes cargados (gateway {GATEWAY_MODE}).")
+    if first:
+        print(startup.report())
+
+@bot.event
+async def on_guild_emojis_update(guild, before, after):
+    emotes.update_guild(guild, after)
+
+@bot.event
+async def on_guild_available(guild):
+    # Tras una reconexión con sesión nueva la caché se rearma y cada servidor vuelve por aquí
+    emotes.update_guild(guild, guild.emojis)
+
+@bot.event
+async def on_guild_join(guild):
+    emotes.update_guild(guild, guild.emojis)
+
+@bot.event
+async def on_guild_remove(guild):
+    emotes.update_guild(guild, ())
 
 @bot.event
 async def on_message(message):
@@ -51,87 +159,42 @@ ROSA_PALO = 0xF2C1D1
 @commands.is_owner()
 async def sync(ctx):
     try:
-        fmt = await bot.tree.sync()
+        fmt = await sync_if_changed(bot.tree, bot.application_id, force=True)
         await ctx.send(f"¡Sincronizados {len(fmt)} comandos con éxito! {emotes.kase}", ephemeral=True)
     except Exception as e:
         await ctx.send(f"Error al sincronizar: {e}")
 
-@bot.hybrid_command(name="add", description="Añade un anime a la lista")
-@app_commands.describe(titulo="Nombre del anime")
-@commands.has_role("purr")
-async def add(ctx: commands.Context, *, titulo: str):
-    data = {"title": titulo, "added_by": ctx.author.name, "status": False}
-    supabase.table("watchlist").insert(data).execute()
-    if emotes.kase:
-        embed = discord.Embed(description=f"{emotes.kase} **{titulo}** añadido a la lista.", color=ROSA_PALO)
-    else:
-        embed = discord.Embed(description=f"**{titulo}** añadido a la lista.", color=ROSA_PALO)
-    await ctx.send(embed=embed)
-
-@bot.hybrid_command(name="random", description="Elige un anime al azar")
-async def ruleta(ctx: commands.Context):
-    response = supabase.table("watchlist").select("*").eq("status", False).execute()
-    if not response.data:
-        return await ctx.send("No hay animes pendientes.")
-    
-    msg = await ctx.send(f"{emotes.mrtitties} Eligiendo.")
-    await asyncio.sleep(0.5)
-    await msg.edit(content=f"{emotes.mrpenis} Eligiendo..")
-    await asyncio.sleep(0.5)
-    await msg.edit(content=f"{emotes.mrballs} Eligiendo...")
-
-    elegido = random.choice(response.data)
-    embed = discord.Embed(title="Pascualito ha elegido...", description=f"**{elegido['title']}**", color=ROSA_PALO)
-    await msg.edit(content=None, embed=embed)
-
-@bot.hybrid_command(name="watched", description="Marca un anime como completado")
-async def visto(ctx: commands.Context):
-    response = supabase.table("watchlist").select("*").eq("status", False).execute()
-    if not response.data:
-        return await ctx.send("No hay pendientes.")
-
-    view = VistoView(response.data)
-    await ctx.send("Elige la serie a marcar como vista:", view=view)
-
-@bot.hybrid_command(name="watchlist", description="Lista de series por ver")
-async def pendientes(ctx: commands.Context):
-    response = supabase.table("watchlist").select("*").eq("status", False).execute()
-    if not response.data:
-        return await ctx.send("¡Todo al día!")
-    
-    view = WatchlistView(response.data, "Lista de Pendientes <:kase:1466627470949089301>")
-    await ctx.send(embed=view.create_embed(), view=view)
-
-@bot.hybrid_command(name="completed", description="Lista de completados")
-async def vistos(ctx: commands.Context):
-    response = supabase.table("watchlist").select("*").eq("status", True).execute()
-    if not response.data:
-        return await ctx.send("Aún no hay vistos.")
-    
-    view = WatchlistView(response.data, "Animes Completados")
-    await ctx.send(embed=view.create_embed(), view=view)
-    
-@bot.hybrid_command(name="delete", description="Elimina un anime (escribe el nombre o usa el menú)")
-@app_commands.describe(titulo="Nombre del anime a borrar (opcional)")
-@commands.has_role("purr")
-async def delete(ctx: commands.Context, *, titulo: str = None):
-    if titulo:
-        result = supabase.table("watchlist").delete().ilike("title", titulo).execute()
-        
-        if result.data:
-            return await ctx.send(f"🗑️ ¡Listo! **{titulo}** borrado de la lista.")
-        else:
-            return await ctx.send(f"❌ No encontré ninguna serie llamada `{titulo}` en los pendientes.")
-
-    
-    response = supabase.table("watchlist").select("*").eq("status", False).execute()
-    animes = response.data
-
-    if not animes:
-        return await ctx.send("No hay animes pendientes para eliminar.")
+@bot.command(name="reload")
+@commands.is_owner()
+async def reload(ctx: commands.Context, nombre: str = None):
+    """p!reload [unitedle|watchlist|flip7]: recarga uno o todos los módulos sin reiniciar."""
+    try:
+        exts = [resolve_extension(nombre)] if nombre else list(EXTENSIONS)
+    except ValueError as e:
+        return await ctx.send(f"❌ {e}")
+
+    lineas = []
+    for ext in exts:
+        try:
+            segundos = await reload_extension(bot, ext)
+            lineas.append(f"♻️ `{ext}` recargado en {segundos * 1000:.0f} ms.")
+        except Exception as e:
+            lineas.append(f"❌ `{ext}` no se pudo recargar (sigue la versión anterior): {e}")
+    try:
+        synced = await sync_if_changed(bot.tree, bot.application_id)
+        if synced is not None:
+            lineas.append(f"✅ {len(synced)} comandos sincronizados.")
+    except Exception as e:
+        lineas.append(f"❌ Error al sincronizar los comandos: {e}")
+    await ctx.send("\n".join(lineas))
 
-    view = DeleteView(animes)
-    await ctx.send("Selecciona el anime que deseas eliminar de la lista:", view=view)
+@bot.command(name="memoria")
+@commands.is_owner()
+async def memoria(ctx: commands.Context, top: int = 5):
+    """p!memoria [top]: RSS, cachés y memoria por subsistema (con TRACEMALLOC=1)."""
+    # El snapshot bloquea el loop un momento; es un comando de diagnóstico del dueño
+    texto = memory.report(bot, top=max(0, min(top, 10)))
+    await ctx.send(f"```\n{texto}\n```")
 
 @bot.hybrid_command(name="roll", description="Lanza un dado (1-100 o 1-N)")
 @app_commands.describe(maximo="El número máximo para el roll (por defecto 100)")
@@ -150,24 +213,26 @@ async def roll(ctx: commands.Context, maximo: int = 100):
     
     await ctx.send(embed=embed)
 
-@bot.hybrid_command(name="flip7", description="Inicia un lobby de Flip 7 multijugador")
-async def flip7(ctx: commands.Context):
-    lobby = Flip7Lobby(ctx.author)
-    await ctx.send(f"🎮 **{ctx.author.name}** ha iniciado un lobby de **Flip 7**. ¡Únanse con el botón de abajo! {emotes.happy}", view=lobby)
+@tasks.loop(seconds=DB_HEALTH_INTERVAL)
+async def health_probe():
+    # También mantiene activo el proyecto de Supabase (antes lo hacía un heartbeat cada 48 h);
+    # los cambios de estado los imprime el circuit breaker
+    await repository.health_check()
+
+@tasks.loop(seconds=HOT_RELOAD_INTERVAL)
+async def watch_cogs(watcher):
+    cambios = watcher.changed()
+    for ext in cambios:
+        try:
+            segundos = await reload_extension(bot, ext)
+            print(f"♻️ {ext} recargado en {segundos * 1000:.0f} ms.")
+        except Exception as e:
+            print(f"❌ No se pudo recargar {ext}: {e}")
+    if cambios:
+        try:
+            await sync_if_changed(bot.tree, bot.application_id)
+        except Exception as e:
+            print(f"❌ Error al sincronizar los comandos: {e}")
 
-@add.error
-@delete.error
-async def delete_error(ctx, error):
-    if isinstance(error, commands.MissingRole):
-        await ctx.send("Ups, necesitas el rol `purr` para realizar esta acción.", ephemeral=True)
-
-@tasks.loop(hours=48)
-async def keep_alive():
-    try:
-        supabase.table("watchlist").select("id").limit(1).execute()
-        print("✅ Heartbeat a Supabase enviado.")
-    except Exception as e:
-        print(f"❌ Error al enviar heartbeat a Supabase: {e}")
-    
 if __name__ == "__main__":
     bot.run(TOKEN)
\ No newline at end of file
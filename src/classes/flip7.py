@@ -1,23 +1,43 @@
 import discord
-import random
 from utils import emotes
-
-class MultiFlip7View(discord.ui.View):
-    def __init__(self, players):
-        super().__init__(timeout=120)
-        random.shuffle(players)
-        self.players = players # Lista de objetos Member
-        self.current_index = 0
-        self.deck = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
-        self.boards = {j.id: [] for j in players}
-        self.final_scores = {} # Para los que se plantan
+from utils.sessions import sessions
+from utils.render import RenderedView, TimedView
+from utils.outbound import outbound
+from classes.flip7_engine import Flip7Game
+
+# Inactividad antes de que el registro cierre la sesión (antes era el timeout de la vista)
+LOBBY_IDLE_TIMEOUT = 60
+GAME_IDLE_TIMEOUT = 120
+
+class MultiFlip7View(RenderedView):
+    def __init__(self, players, seed=None, game=None):
+        # Sin timeout propio: el registro de sesiones la cierra por inactividad
+        super().__init__(timeout=None)
+        # Las reglas viven en Flip7Game; la vista solo dibuja su estado
+        self.game = game or Flip7Game([j.id for j in players], seed=seed)
+        self.members = {j.id: j for j in players}
+        self.session_key = None
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        sessions.touch(self.session_key)
+        return True
+
+    def snapshot(self):
+        return {"game": self.game.to_dict()}
+
+    def render_key(self):
+        return self.game.version
+
+    @property
+    def players(self):
+        return [self.members[j_id] for j_id in self.game.player_ids] # En orden de turno
 
     def get_current_player(self):
-        return self.players[self.current_index]
+        return self.members[self.game.current_player]
 
     def create_embed(self):
         player = self.get_current_player()
-        cards = self.boards[player.id]
+        cards = self.game.hands[player.id].cards
         
         embed = discord.Embed(
             title=f"{emotes.kase} Flip 7 Multiplayer {emotes.kasen}",
@@ -28,33 +48,29 @@ class MultiFlip7View(discord.ui.View):
         # Mostrar estado de todos
         status_text = ""
         for j in self.players:
-            score = sum(self.boards[j.id])
-            emoji = "✅" if j.id in self.final_scores else "🎲"
+            score = self.game.hands[j.id].total
+            emoji = "✅" if j.id in self.game.final_scores else "🎲"
             status_text += f"{emoji} **{j.name}**: {score} pts\n"
         
         embed.add_field(name="Estadísticas de la mesa", value=status_text, inline=False)
         embed.add_field(name="🃏 Cartas en tu mano", value=f"`{cards if cards else 'Vacío'}`", inline=True)
         return embed
 
-    async def stay_turn(self, interaction):
-        # Buscamos al siguiente player que no se haya plantado
-        original_index = self.current_index
-        while True:
-            self.current_index = (self.current_index + 1) % len(self.players)
-            if self.players[self.current_index].id not in self.final_scores:
-                break
-            if self.current_index == original_index: # Todos se plantaron
-                await self.end_game(interaction)
-                return
+    async def next_turn(self, interaction):
+        if self.game.finished: # Todos se plantaron
+            await self.end_game(interaction)
+            return
 
-        await interaction.response.edit_message(embed=self.create_embed(), view=self)
+        await self.refresh(interaction)
 
     async def end_game(self, interaction):
         self.stop()
+        self.cancel_render()
+        sessions.remove(self.session_key)
         
         # 1. Convertimos el diccionario en una lista de tuplas (user_id, score) 
         # y la ordenamos de mayor a menor puntuación
-        sorted_results = sorted(self.final_scores.items(), key=lambda item: item[1], reverse=True)
+        sorted_results = self.game.results()
         
         desc = "🏆 **Resultados Finales:**\n\n"
         
@@ -63,7 +79,7 @@ class MultiFlip7View(discord.ui.View):
         podium_count = 0
 
         for j_id, score in sorted_results:
-            user = discord.utils.get(self.players, id=j_id)
+            user = self.members[j_id]
             
             # Caso: El jugador NO hizo Bust (puntos > 0)
             if score > 0:
@@ -79,9 +95,9 @@ class MultiFlip7View(discord.ui.View):
             else:
                 desc += f"{emotes.pp} **{user.name}**: BUST (0 pts)\n"
 
-        survivors = [s for s in sorted_results if s[1] > 0]
-        if survivors:
-            winner = discord.utils.get(self.players, id=survivors[0][0])
+        winner_id = self.game.winner()
+        if winner_id is not None:
+            winner = self.members[winner_id]
             desc += f"\n\n\n{emotes.happy} ¡**{winner.name}** ha ganado! {emotes.happy}"
         else:
             desc += f"\n\n\n🤡 Todos hicieron bust... nadie gana {emotes.pn}"
@@ -95,41 +111,44 @@ class MultiFlip7View(discord.ui.View):
 
         await interaction.response.edit_message(embed=embed, view=None)
 
-    @discord.ui.button(label="Flip", style=discord.ButtonStyle.primary, emoji="🎲")
+    @discord.ui.button(label="Flip", style=discord.ButtonStyle.primary, emoji="🎲", custom_id="flip7:flip")
     async def flip(self, interaction: discord.Interaction, button: discord.ui.Button):
         player = self.get_current_player()
-        if interaction.user != player:
+        if interaction.user.id != player.id:
             return await interaction.response.send_message(f"No es tu turno, espera un pokito mierda {emotes.angi}", ephemeral=True)
 
-        card = random.choice(self.deck)
-        hand = self.boards[player.id]
+        result = self.game.flip()
 
-        if card in hand: # BUST
-            self.final_scores[player.id] = 0
-            await interaction.channel.send(f"💥 ¡BUST! {player.mention} sacó un {card} repetido y perdió sus puntos. {emotes.jojojo}{emotes.jojojo}{emotes.jojojo}")
-            await self.stay_turn(interaction)
+        if result.bust:
+            # Va por la cola sin esperar: la respuesta al click no se retrasa por el aviso
+            await outbound.send(interaction.channel, f"💥 ¡BUST! {player.mention} sacó un {result.card} repetido y perdió sus puntos. {emotes.jojojo}{emotes.jojojo}{emotes.jojojo}", wait=False)
+            await self.next_turn(interaction)
         else:
-            hand.append(card)
-            await interaction.response.edit_message(embed=self.create_embed(), view=self)
+            await self.refresh(interaction)
 
-    @discord.ui.button(label="Stay", style=discord.ButtonStyle.success, emoji="✅")
+    @discord.ui.button(label="Stay", style=discord.ButtonStyle.success, emoji="✅", custom_id="flip7:stay")
     async def stay(self, interaction: discord.Interaction, button: discord.ui.Button):
         player = self.get_current_player()
-        if interaction.user != player:
+        if interaction.user.id != player.id:
             return await interaction.response.send_message(f"No es tu turno, espera un pokito mierda {emotes.angi}", ephemeral=True)
 
-        self.final_scores[player.id] = sum(self.boards[player.id])
-        await self.stay_turn(interaction)
+        self.game.stay()
+        await self.next_turn(interaction)
 
-class Flip7Lobby(discord.ui.View):
+class Flip7Lobby(TimedView):
     def __init__(self, creador):
-        super().__init__(timeout=60)
+        super().__init__(timeout=None)
         self.creador = creador
         self.players = [creador]
+        self.session_key = None
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        sessions.touch(self.session_key)
+        return True
 
     @discord.ui.button(label="Unirse", style=discord.ButtonStyle.secondary)
     async def join(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user in self.players:
+        if any(j.id == interaction.user.id for j in self.players):
             return await interaction.response.send_message(f"Ya estás en la lista, ¡espera a que empiece! {emotes.angii}", ephemeral=True)
         
         self.players.append(interaction.user)
@@ -137,8 +156,20 @@ class Flip7Lobby(discord.ui.View):
 
     @discord.ui.button(label="Iniciar Juego", style=discord.ButtonStyle.success)
     async def start(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user != self.creador:
+        if interaction.user.id != self.creador.id:
             return await interaction.response.send_message(f"Solo quien inició el lobby puede empezar el juego {emotes.angii}", ephemeral=True)
         
+        self.stop()
         game_view = MultiFlip7View(self.players)
-        await interaction.response.edit_message(content=None, embed=game_view.create_embed(), view=game_view)
\ No newline at end of file
+        await interaction.response.edit_message(content=None, embed=game_view.render(), view=game_view)
+        await sessions.register(interaction.message, game_view, "flip7", self.creador.id, GAME_IDLE_TIMEOUT)
+
+async def restore_game(bot, state):
+    """Reconstruye una partida guardada en el snapshot de sesiones."""
+    players = []
+    for j_id in state["game"]["players"]:
+        user = bot.get_user(j_id) or await bot.fetch_user(j_id)
+        players.append(user)
+    return MultiFlip7View(players, game=Flip7Game.from_dict(state["game"]))
+
+sessions.register_restorer("flip7", restore_game)
\ No newline at end of file
@@ -0,0 +1,123 @@
+# src/classes/flip7_engine.py
+# Reglas de Flip 7 sin nada de Discord: MultiFlip7View solo dibuja este estado.
+import random
+
+DECK = tuple(range(1, 13))
+
+class Hand:
+    __slots__ = ("cards", "mask", "total")
+
+    def __init__(self):
+        self.cards = []
+        self.mask = 0  # bit n encendido = ya tiene la carta n
+        self.total = 0
+
+    def has(self, card):
+        return self.mask >> card & 1
+
+    def add(self, card):
+        self.cards.append(card)
+        self.mask |= 1 << card
+        self.total += card
+
+    def __len__(self):
+        return len(self.cards)
+
+class FlipResult:
+    __slots__ = ("player_id", "card", "bust")
+
+    def __init__(self, player_id, card, bust):
+        self.player_id = player_id
+        self.card = card
+        self.bust = bust
+
+class Flip7Game:
+    """Una partida: cada jugador saca cartas (con reposición) hasta plantarse o repetir una.
+
+    Repetir carta es BUST y deja al jugador con 0 puntos. El turno solo pasa
+    cuando el jugador actual se planta o hace bust.
+    """
+
+    __slots__ = ("player_ids", "current_index", "deck", "hands", "final_scores", "rng", "finished", "version")
+
+    def __init__(self, player_ids, seed=None, rng=None, shuffle=True, deck=DECK):
+        self.rng = rng or random.Random(seed)
+        self.player_ids = list(player_ids)
+        if shuffle:
+            self.rng.shuffle(self.player_ids)
+        self.current_index = 0
+        self.deck = deck
+        self.hands = {pid: Hand() for pid in self.player_ids}
+        self.final_scores = {}  # Para los que se plantan (o hicieron bust)
+        self.finished = False
+        self.version = 0  # Sube con cada jugada; sirve para saber si hay que redibujar
+
+    @property
+    def current_player(self):
+        return self.player_ids[self.current_index]
+
+    @property
+    def current_hand(self):
+        return self.hands[self.current_player]
+
+    def flip(self):
+        player_id = self.current_player
+        hand = self.hands[player_id]
+        card = self.rng.choice(self.deck)
+        self.version += 1
+
+        if hand.has(card):  # BUST
+            self.final_scores[player_id] = 0
+            self._advance()
+            return FlipResult(player_id, card, True)
+
+        hand.add(card)
+        return FlipResult(player_id, card, False)
+
+    def stay(self):
+        player_id = self.current_player
+        self.version += 1
+        self.final_scores[player_id] = self.hands[player_id].total
+        self._advance()
+        return self.final_scores[player_id]
+
+    def _advance(self):
+        # Buscamos al siguiente jugador que no se haya plantado
+        original_index = self.current_index
+        while True:
+            self.current_index = (self.current_index + 1) % len(self.player_ids)
+            if self.player_ids[self.current_index] not in self.final_scores:
+                return
+            if self.current_index == original_index:  # Todos se plantaron
+                self.finished = True
+                return
+
+    def to_dict(self):
+        """Estado compacto para guardar la partida (el RNG no se guarda)."""
+        return {
+            "players": self.player_ids,
+            "turn": self.current_index,
+            "hands": {str(pid): hand.cards for pid, hand in self.hands.items()},
+            "final": {str(pid): score for pid, score in self.final_scores.items()},
+            "finished": self.finished,
+        }
+
+    @classmethod
+    def from_dict(cls, data, seed=None):
+        game = cls(data["players"], seed=seed, shuffle=False)
+        game.current_index = data["turn"]
+        for pid, cards in data["hands"].items():
+            hand = game.hands[int(pid)]
+            for card in cards:
+                hand.add(card)
+        game.final_scores = {int(pid): score for pid, score in data["final"].items()}
+        game.finished = data["finished"]
+        return game
+
+    def results(self):
+        """[(player_id, puntos), ...] de mayor a menor."""
+        return sorted(self.final_scores.items(), key=lambda item: item[1], reverse=True)
+
+    def winner(self):
+        survivors = [r for r in self.results() if r[1] > 0]
+        return survivors[0][0] if survivors else None
@@ -0,0 +1,59 @@
+import time
+from discord.ext import commands, tasks
+from utils import emotes
+from utils.sessions import sessions
+from classes.flip7 import Flip7Lobby, LOBBY_IDLE_TIMEOUT
+
+# Se recargan junto con este cog, en este orden. Las partidas en curso siguen
+# con la vista que ya tenían; las nuevas usan el código recargado.
+RELOAD_MODULES = ("classes.flip7_engine", "classes.flip7")
+
+class Flip7(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # Las sesiones viven en `sessions`; solo hay que saber si el snapshot ya se restauró
+        state = bot.cog_state.pop("flip7", {})
+        self.restored = state.get("restored", False)
+
+    async def cog_load(self):
+        self.evict_idle_sessions.start()
+
+    async def cog_unload(self):
+        self.evict_idle_sessions.cancel()
+        self.bot.cog_state["flip7"] = {"restored": self.restored}
+
+    @tasks.loop(seconds=15)
+    async def evict_idle_sessions(self):
+        await sessions.evict_idle()
+
+    @evict_idle_sessions.before_loop
+    async def before_evict_idle_sessions(self):
+        await self.bot.wait_until_ready()
+        if self.restored:
+            return
+        self.restored = True
+        inicio = time.perf_counter()
+        restauradas = await sessions.restore_snapshot(self.bot)
+        if restauradas:
+            print(f"♻️ {restauradas} partidas restauradas en {(time.perf_counter() - inicio) * 1000:.0f} ms.")
+
+    @commands.hybrid_command(name="flip7", description="Inicia un lobby de Flip 7 multijugador")
+    async def flip7(self, ctx: commands.Context):
+        permitido, motivo = sessions.can_open(ctx.guild.id if ctx.guild else None, ctx.author.id)
+        if not permitido:
+            return await ctx.send(f"{motivo} {emotes.angii}", ephemeral=True)
+
+        lobby = Flip7Lobby(ctx.author)
+        msg = await ctx.send(f"🎮 **{ctx.author.name}** ha iniciado un lobby de **Flip 7**. ¡Únanse con el botón de abajo! {emotes.happy}", view=lobby)
+        await sessions.register(msg, lobby, "flip7_lobby", ctx.author.id, LOBBY_IDLE_TIMEOUT)
+
+    @commands.command(name="sessions")
+    @commands.is_owner()
+    async def sessions_info(self, ctx: commands.Context):
+        stats = sessions.stats()
+        detalle = ", ".join(f"{k}: {v}" for k, v in stats['by_kind'].items()) or "ninguna"
+        await ctx.send(f"🎮 **Sesiones activas:** {stats['total']} en {stats['guilds']} servidores ({detalle})\n"
+                       f"Memoria aproximada: {stats['approx_bytes'] / 1024:.1f} KB")
+
+async def setup(bot):
+    await bot.add_cog(Flip7(bot))
@@ -1,93 +1,304 @@
+import io
+import os
+import asyncio
+from functools import cached_property
 import discord
 from discord import app_commands
-from discord.ext import commands
-from datetime import datetime
+from discord.ext import commands, tasks
+from datetime import datetime, timedelta, time
+from zoneinfo import ZoneInfo
 from utils import emotes
-from utils.database import supabase
+from utils import repository
+from utils.daily_cache import DailyCache
+from utils.roster import RosterIndex
+from utils.unitedle_stats import StatsStore
+from utils.daily_scheduler import plan_selections, days_covered
+from utils.hint_pack import HintPack
+from utils.image_normalizer import normalize_filename
+from utils.outbound import outbound
 
-class Unitedle(commands.Cog):
-    def __init__(self, bot, supabase):
+# Zona horaria del "día" de Unitedle. Una ZoneInfo (y no el offset fijo del
+# arranque) sigue los cambios de horario de verano.
+UNITEDLE_TZ = ZoneInfo(os.getenv("UNITEDLE_TZ") or os.getenv("TZ") or "UTC")
+# Hora a la que se precarga el Pokémon del día siguiente
+PREWARM_TIME = time(23, 55, tzinfo=UNITEDLE_TZ)
+
+def now():
+    """Reloj de Unitedle: lo usan los comandos, el planificador y la precarga."""
+    return datetime.now(UNITEDLE_TZ)
+
+def current_date():
+    return now().strftime("%Y-%m-%d")
+
+# Ventana de días futuros que el bot mantiene con Pokémon ya elegido
+SCHEDULE_DAYS = int(os.getenv("UNITEDLE_SCHEDULE_DAYS", "30"))
+# Se rellena en bloque solo cuando quedan menos de estos días programados
+REFILL_DAYS = int(os.getenv("UNITEDLE_REFILL_DAYS", "7"))
+NO_REPEAT_DAYS = int(os.getenv("UNITEDLE_NO_REPEAT_DAYS", "14"))
+# Generado offline con src/utils/render_hints.py
+HINTS_PATH = os.getenv("UNITEDLE_HINTS_PATH", os.path.join(os.path.dirname(__file__), "..", "..", "assets", "hints.pack"))
+
+class Unitedle(commands.GroupCog, group_name="unitedle", group_description="Adivina el Pokémon del día."):
+    def __init__(self, bot, repository):
         self.bot = bot
-        self.supabase = supabase
+        self.repository = repository
+        # Al recargar el cog, la instancia anterior deja aquí sus cachés (ver cog_unload)
+        state = bot.cog_state.pop("unitedle", None)
+        self.handed_over = state is not None
+        if state:
+            self.daily_cache = state["daily_cache"]
+            self.roster = state["roster"]
+            self.stats = state["stats"]
+            self.hints = state["hints"]
+            if state["feedback"] is not None:
+                self.feedback = state["feedback"]
+        else:
+            self.daily_cache = DailyCache(repository.get_daily_pokemon)
+            self.roster = RosterIndex.from_json()
+            self.stats = StatsStore(repository.get_all_stats)
+            self.hints = HintPack.open_if_exists(HINTS_PATH)
+
+    @cached_property
+    def feedback(self):
+        # numpy + la matriz cuestan ~130 ms: no los pagamos antes de conectar
+        from utils.feedback import FeedbackMatrix
+        return FeedbackMatrix(self.roster.names)
+
+    async def cog_load(self):
+        if not self.handed_over:
+            try:
+                await self.stats.load()
+            except Exception as e:
+                print(f"❌ Error al cargar las estadísticas de Unitedle: {e}")
+        self.schedule_daily.start()
+        self.prewarm_daily.start()
+        self._warmup = asyncio.create_task(self.warm_feedback())
+
+    async def warm_feedback(self):
+        """Arma la matriz en un hilo apenas el bot está conectado, antes del primer intento."""
+        await self.bot.wait_until_ready()
+        await asyncio.to_thread(lambda: self.feedback)
+
+    async def cog_unload(self):
+        self.schedule_daily.cancel()
+        self.prewarm_daily.cancel()
+        self._warmup.cancel()
+        # El mmap de pistas no se cierra: pasa a la instancia recargada (o se cierra al salir)
+        self.bot.cog_state["unitedle"] = {
+            "daily_cache": self.daily_cache,
+            "roster": self.roster,
+            "stats": self.stats,
+            "hints": self.hints,
+            "feedback": self.__dict__.get("feedback"),  # None si la matriz aún no se armó
+        }
+
+    @tasks.loop(hours=12)
+    async def schedule_daily(self):
+        today = now().date()
+        since = today - timedelta(days=NO_REPEAT_DAYS)
+        try:
+            history = await self.repository.get_daily_history(since.isoformat())
+            if days_covered(history, today) >= REFILL_DAYS:
+                return
+
+            pool = await self.repository.get_pokemon_ids()
+            rows = plan_selections(pool, history, today, SCHEDULE_DAYS, NO_REPEAT_DAYS)
+            if rows:
+                await self.repository.insert_daily_selections(rows)
+                self.daily_cache.clear_missing()
+                print(f"✅ Unitedle programado: {len(rows)} días nuevos hasta {rows[-1]['date']}.")
+        except Exception as e:
+            print(f"❌ Error al programar los Pokémon diarios: {e}")
+
+    @tasks.loop(time=PREWARM_TIME)
+    async def prewarm_daily(self):
+        # Deja listo el de mañana antes de las 00:00 para que el cambio de día no toque la DB
+        # Corre a las 23:55 de UNITEDLE_TZ: "mañana" es el día siguiente en esa misma zona
+        current = now()
+        tomorrow = (current.date() + timedelta(days=1)).isoformat()
+        self.daily_cache.evict_before(current.strftime("%Y-%m-%d"))
+        try:
+            await self.daily_cache.prefetch(tomorrow)
+            print(f"✅ Unitedle precargado para {tomorrow}.")
+        except Exception as e:
+            print(f"❌ Error al precargar Unitedle para {tomorrow}: {e}")
+
+    @prewarm_daily.before_loop
+    async def before_prewarm_daily(self):
+        await self.bot.wait_until_ready()
+        try:
+            await self.daily_cache.get(current_date())
+        except Exception as e:
+            print(f"❌ Error al cargar el Unitedle de hoy: {e}")
 
-    @app_commands.command(name="unitedle", description="Adivina el Pokémon del día.")
+    @commands.command(name="unitedlecache")
+    @commands.is_owner()
+    async def unitedle_cache(self, ctx: commands.Context):
+        stats = self.daily_cache.stats()
+        await ctx.send(
+            f"📦 **Caché Unitedle**\nHits: {stats['hits']} | Misses: {stats['misses']} | "
+            f"Queries: {stats['loads']} | Hit rate: {stats['hit_rate']:.1%}\nFechas: {', '.join(stats['dates']) or '—'}"
+        )
+
+    @app_commands.command(name="play", description="Adivina el Pokémon del día.")
+    @app_commands.describe(guess="Nombre del Pokémon")
     async def unitedle(self, interaction: discord.Interaction, guess: str = None):
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = current_date()
         
-        daily = self.supabase.table("daily_pokemon").select("*, pokemon_unite(*)").eq("date", today).single().execute()
+        daily = await self.daily_cache.get(today)
         
-        if not daily.data:
+        if not daily:
             await interaction.response.send_message("⚠️ Aún no se ha seleccionado el Pokémon de hoy. Inténtalo más tarde.", ephemeral=True)
             return
 
-        pokemon = daily.data['pokemon_unite']
+        pokemon = daily['pokemon_unite']
         target_name = pokemon['name'].upper()
 
-        already_won = self.supabase.table("user_attempts").select("*") \
-            .eq("user_id", interaction.user.id) \
-            .eq("date", today) \
-            .eq("guess", target_name).execute()
-        
-        if already_won.data:
-            await interaction.response.send_message(f"{emotes.angii} Ya adivinaste el Pokémon de hoy, inténtalo de nuevo a las 00:00.\n El Pokémon era: **{target_name}**", ephemeral=True)
-            return
-
         if not guess:
+            already_won = await self.repository.get_winning_attempt(interaction.user.id, today, target_name)
+            if already_won:
+                await interaction.response.send_message(f"{emotes.angii} Ya adivinaste el Pokémon de hoy, inténtalo de nuevo a las 00:00.\n El Pokémon era: **{target_name}**", ephemeral=True)
+                return
+
             await interaction.response.send_message(f"{emotes.kase} **Unitedle**\nEl Pokémon de hoy tiene {len(target_name)} letras. Cada 3 intentos recibirás una pista adicional. ¡Buena suerte! {emotes.kase}", ephemeral=True)
             return
 
-        check_exists = self.supabase.table("pokemon_unite").select("id").eq("name", guess.title()).execute()
-        if not check_exists.data:
+        nombre = self.roster.resolve(guess)
+        if not nombre:
             await interaction.response.send_message(f"{emotes.tomatewn} '{guess}' no es un Pokémon válido en Unite.", ephemeral=True)
             return
 
-        guess = guess.upper()
-        attempts_data = self.supabase.table("user_attempts").select("*").eq("user_id", interaction.user.id).eq("date", today).execute()
-        num_intentos = len(attempts_data.data) + 1
-        
+        guess = nombre.upper()
         feedback = self.generate_feedback(guess, target_name)
-        
-        self.supabase.table("user_attempts").insert({
-            "user_id": interaction.user.id, 
-            "attempt_number": num_intentos, 
-            "guess": guess,
-            "result_json": feedback
-        }).execute()
+
+        # Un solo viaje a la DB: registra el intento y devuelve número, victoria y nivel de pista
+        result = await self.repository.submit_guess(interaction.user.id, today, guess, target_name, feedback)
+
+        if result['already_won']:
+            await interaction.response.send_message(f"{emotes.angii} Ya adivinaste el Pokémon de hoy, inténtalo de nuevo a las 00:00.\n El Pokémon era: **{target_name}**", ephemeral=True)
+            return
+
+        num_intentos = result['attempt_number']
+        hint_level = result['hint_level']
+
+        if result.get('stats'):
+            self.stats.apply(result['stats'])  # La misma llamada ya actualizó unitedle_stats
 
         embed = discord.Embed(title=f"Unitedle - Intento {num_intentos}", description=f"Tu intento: `{guess}`\nResultado: `{feedback}`")
         
-        if num_intentos >= 3:
+        if hint_level >= 1:
             embed.add_field(name="Pista 1 (Rol)", value=pokemon['role'], inline=True)
-        if num_intentos >= 6:
+        if hint_level >= 2:
             evol = "Sí" if pokemon['evolves'] else "No"
             embed.add_field(name="Pista 2 (Evoluciona)", value=evol, inline=True)
-        if num_intentos >= 9:
+        if hint_level >= 3:
             mega = "Sí" if pokemon['has_mega'] else "No"
             embed.add_field(name="Pista 3 (Mega)", value=mega, inline=True)
 
-        if guess == target_name:
+        if result['won']:
             embed.title = f"¡Ganaste! {emotes.oshahappy}"
             embed.set_image(url=pokemon['image_url'])
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
-            await interaction.channel.send(f"{emotes.bleh} ¡{interaction.user.mention} ha acertado el Pokémon del día!")
+            outbound.announce(interaction.channel, interaction.user.mention, key="unitedle-win", render=self.render_winners)
         else:
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            hint = self.hint_image(pokemon['name'], hint_level)
+            if hint:
+                embed.set_image(url=f"attachment://{hint.filename}")
+                await interaction.response.send_message(embed=embed, file=hint, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    def generate_feedback(self, guess, target):
-        result = ["⬜"] * len(target)
-        target_list = list(target)
-        
-        for i in range(min(len(guess), len(target))):
-            if guess[i] == target[i]:
-                result[i] = "🟩"
-                target_list[i] = None
+    @staticmethod
+    def render_winners(mentions):
+        if len(mentions) == 1:
+            return f"{emotes.bleh} ¡{mentions[0]} ha acertado el Pokémon del día!"
+        return f"{emotes.bleh} ¡{', '.join(mentions[:-1])} y {mentions[-1]} han acertado el Pokémon del día!"
+
+    def hint_image(self, name, hint_level):
+        """Pista visual ya renderizada para el nivel alcanzado, servida desde el mmap."""
+        if not self.hints or hint_level < 1:
+            return None
+        tiers = [t for t in self.hints.tiers(normalize_filename(name)) if t <= hint_level]
+        if not tiers:
+            return None
+        data = self.hints.get(normalize_filename(name), tiers[-1])
+        return discord.File(io.BytesIO(data), filename=f"pista{tiers[-1]}.png")
+
+    @unitedle.autocomplete("guess")
+    async def guess_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=n, value=n) for n in self.roster.search(current)]
 
-        for i in range(min(len(guess), len(target))):
-            if result[i] == "⬜" and guess[i] in target_list:
-                result[i] = "🟨"
-                target_list[target_list.index(guess[i])] = None
-        return "".join(result)
+    @app_commands.command(name="candidates", description="¿Cuántos Pokémon siguen encajando con tus intentos de hoy?")
+    async def candidates(self, interaction: discord.Interaction):
+        today = current_date()
+
+        daily = await self.daily_cache.get(today)
+        if not daily:
+            await interaction.response.send_message("⚠️ Aún no se ha seleccionado el Pokémon de hoy. Inténtalo más tarde.", ephemeral=True)
+            return
+
+        target_name = daily['pokemon_unite']['name'].upper()
+        attempts = await self.repository.get_user_attempts(interaction.user.id, today)
+        if not attempts:
+            await interaction.response.send_message(f"{emotes.kase} Aún no has intentado hoy: los {len(self.roster)} Pokémon siguen en juego.", ephemeral=True)
+            return
+        if any(a['guess'] == target_name for a in attempts):
+            await interaction.response.send_message(f"{emotes.angii} Ya adivinaste el Pokémon de hoy: **{target_name}**", ephemeral=True)
+            return
+
+        restantes = self.feedback.count_candidates((a['guess'], a['result_json']) for a in attempts)
+        await interaction.response.send_message(
+            f"🔎 Con tus {len(attempts)} intentos quedan **{restantes}** de {len(self.roster)} Pokémon posibles.",
+            ephemeral=True
+        )
+
+    @app_commands.command(name="stats", description="Tus estadísticas de Unitedle.")
+    @app_commands.describe(usuario="Jugador a consultar (por defecto, tú)")
+    async def stats_command(self, interaction: discord.Interaction, usuario: discord.User = None):
+        usuario = usuario or interaction.user
+        stats = self.stats.get(usuario.id)
+        if not stats or not stats.played:
+            await interaction.response.send_message(f"{emotes.tomatewn} **{usuario.name}** aún no ha jugado Unitedle.", ephemeral=True)
+            return
+
+        today = current_date()
+        embed = discord.Embed(title=f"Unitedle - {usuario.name}", color=0xF2C1D1)
+        embed.add_field(name="Partidas", value=stats.played, inline=True)
+        embed.add_field(name="Victorias", value=f"{stats.wins} ({stats.win_rate:.0%})", inline=True)
+        embed.add_field(name="Promedio de intentos", value=f"{stats.average_attempts:.1f}", inline=True)
+        embed.add_field(name="Racha actual", value=stats.streak_on(today), inline=True)
+        embed.add_field(name="Mejor racha", value=stats.best_streak, inline=True)
+
+        if stats.histogram:
+            top = max(stats.histogram.values())
+            lineas = [
+                f"`{k:>2}` {'▇' * max(1, round(v / top * 10))} {v}"
+                for k, v in sorted(stats.histogram.items(), key=lambda item: int(item[0]))
+            ]
+            embed.add_field(name="Intentos por victoria", value="\n".join(lineas), inline=False)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="leaderboard", description="Top de jugadores de Unitedle.")
+    async def leaderboard(self, interaction: discord.Interaction):
+        top = self.stats.leaderboard(10)
+        if not top:
+            await interaction.response.send_message("Aún nadie ha ganado un Unitedle.", ephemeral=True)
+            return
+
+        today = current_date()
+        medals = ["🥇", "🥈", "🥉"]
+        desc = ""
+        for i, stats in enumerate(top):
+            puesto = medals[i] if i < len(medals) else f"`{i + 1}.`"
+            desc += f"{puesto} <@{stats.user_id}>: **{stats.wins}** victorias · racha {stats.streak_on(today)} (mejor {stats.best_streak})\n"
+
+        embed = discord.Embed(title=f"🏆 Leaderboard Unitedle {emotes.kase}", description=desc, color=0xF2C1D1)
+        await interaction.response.send_message(embed=embed)
+
+    def generate_feedback(self, guess, target):
+        return self.feedback.feedback(guess, target)
 
 async def setup(bot):
-    await bot.add_cog(Unitedle(bot, supabase))
\ No newline at end of file
+    await bot.add_cog(Unitedle(bot, repository))
\ No newline at end of file
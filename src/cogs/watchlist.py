@@ -0,0 +1,173 @@
+import io
+import random
+import asyncio
+import discord
+from typing import Literal
+from discord import app_commands
+from discord.ext import commands, tasks
+from utils import emotes
+from utils.watchlist_store import watchlist
+from utils.watchlist_io import parse_import, export_rows
+from utils.outbound import outbound, HIGH
+from classes.watchlist import WatchlistView, title_choices
+
+# Se recargan junto con este cog (no guardan estado propio)
+RELOAD_MODULES = ("classes.watchlist",)
+
+ROSA_PALO = 0xF2C1D1
+MAX_IMPORT_BYTES = 5_000_000
+REFRESH_MINUTES = 5
+# Mientras no se haya cargado, los comandos responden "no disponible" y se reintenta seguido
+LOAD_RETRY_SECONDS = 30
+
+class Watchlist(commands.Cog):
+    # Los datos viven en el singleton `watchlist`, así que recargar el cog no los toca
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        if not watchlist.loaded:
+            try:
+                await watchlist.load()
+                print("✅ Watchlist cargado en memoria.")
+            except Exception as e:
+                print(f"❌ Error al cargar el watchlist (se reintenta cada {LOAD_RETRY_SECONDS} s): {e}")
+        self.refresh_watchlist.start()
+
+    async def cog_unload(self):
+        self.refresh_watchlist.cancel()
+
+    @tasks.loop(minutes=REFRESH_MINUTES)
+    async def refresh_watchlist(self):
+        try:
+            if watchlist.loaded:
+                await watchlist.refresh()
+            else:
+                await watchlist.load()
+                print("✅ Watchlist cargado en memoria.")
+        except Exception as e:
+            print(f"❌ Error al refrescar el watchlist: {e}")
+        if watchlist.loaded:
+            if self.refresh_watchlist.minutes != REFRESH_MINUTES:
+                self.refresh_watchlist.change_interval(minutes=REFRESH_MINUTES)
+        elif self.refresh_watchlist.seconds != LOAD_RETRY_SECONDS:
+            self.refresh_watchlist.change_interval(seconds=LOAD_RETRY_SECONDS)
+
+    @refresh_watchlist.before_loop
+    async def before_refresh_watchlist(self):
+        await self.bot.wait_until_ready()
+
+    @commands.hybrid_command(name="add", description="Añade un anime a la lista")
+    @app_commands.describe(titulo="Nombre del anime")
+    @commands.has_role("purr")
+    async def add(self, ctx: commands.Context, *, titulo: str):
+        await watchlist.add(titulo, ctx.author.name)
+        embed = discord.Embed(description=f"{emotes.kase} **{titulo}** añadido a la lista.", color=ROSA_PALO)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="random", description="Elige un anime al azar")
+    async def ruleta(self, ctx: commands.Context):
+        pendientes = watchlist.list(False)
+        if not pendientes:
+            return await ctx.send("No hay animes pendientes.")
+
+        msg = await ctx.send(f"{emotes.mrtitties} Eligiendo.")
+        # Los frames van por la cola: si el canal está saturado, el resultado reemplaza a los que no salieron
+        frame = ("ruleta", msg.id)
+        await asyncio.sleep(0.5)
+        await outbound.edit(msg, key=frame, wait=False, content=f"{emotes.mrpenis} Eligiendo..")
+        await asyncio.sleep(0.5)
+        await outbound.edit(msg, key=frame, wait=False, content=f"{emotes.mrballs} Eligiendo...")
+
+        elegido = random.choice(pendientes)
+        embed = discord.Embed(title="Pascualito ha elegido...", description=f"**{elegido['title']}**", color=ROSA_PALO)
+        await outbound.edit(msg, key=frame, priority=HIGH, content=None, embed=embed)
+
+    @commands.hybrid_command(name="watched", description="Marca un anime como completado")
+    @app_commands.describe(titulo="Nombre del anime visto")
+    async def visto(self, ctx: commands.Context, *, titulo: str):
+        anime = watchlist.resolve(titulo, status=False)
+        if not anime:
+            return await ctx.send(f"❌ No encontré ninguna serie llamada `{titulo}` en los pendientes.")
+
+        await watchlist.mark_watched(anime['id'])
+        await ctx.send(f"✅ ¡Listo! **{anime['title']}** ahora está en la lista de vistos.")
+
+    @visto.autocomplete("titulo")
+    async def visto_autocomplete(self, interaction: discord.Interaction, current: str):
+        return title_choices(watchlist, current, status=False)
+
+    @commands.hybrid_command(name="watchlist", description="Lista de series por ver")
+    async def pendientes(self, ctx: commands.Context):
+        if not watchlist.count(False):
+            return await ctx.send("¡Todo al día!")
+
+        view = WatchlistView(watchlist, False, f"Lista de Pendientes {emotes.kase}")
+        await ctx.send(embed=view.render(), view=view)
+
+    @commands.hybrid_command(name="completed", description="Lista de completados")
+    async def vistos(self, ctx: commands.Context):
+        if not watchlist.count(True):
+            return await ctx.send("Aún no hay vistos.")
+
+        view = WatchlistView(watchlist, True, "Animes Completados")
+        await ctx.send(embed=view.render(), view=view)
+
+    @commands.hybrid_command(name="delete", description="Elimina un anime de la lista")
+    @app_commands.describe(titulo="Nombre del anime a borrar")
+    @commands.has_role("purr")
+    async def delete(self, ctx: commands.Context, *, titulo: str):
+        anime = watchlist.resolve(titulo)
+        if not anime:
+            return await ctx.send(f"❌ No encontré ninguna serie llamada `{titulo}` en la lista.")
+
+        borrados = await watchlist.delete(anime['id'])
+        if borrados:
+            await ctx.send(f"🗑️ ¡Listo! **{anime['title']}** borrado de la lista.")
+        else:
+            await ctx.send(f"❌ Hubo un error al intentar borrar **{anime['title']}**.", ephemeral=True)
+
+    @delete.autocomplete("titulo")
+    async def delete_autocomplete(self, interaction: discord.Interaction, current: str):
+        return title_choices(watchlist, current)
+
+    @commands.hybrid_command(name="import", description="Importa animes desde un CSV, JSON o export de MyAnimeList")
+    @app_commands.describe(archivo="Archivo .csv, .json o .xml(.gz) de MyAnimeList")
+    @commands.has_role("purr")
+    async def importar(self, ctx: commands.Context, archivo: discord.Attachment):
+        if archivo.size > MAX_IMPORT_BYTES:
+            return await ctx.send(f"❌ El archivo es muy grande (máximo {MAX_IMPORT_BYTES // 1_000_000} MB).", ephemeral=True)
+
+        await ctx.defer()
+        try:
+            entries = parse_import(archivo.filename, await archivo.read())
+        except Exception as e:
+            return await ctx.send(f"❌ No pude leer `{archivo.filename}`: {e}")
+
+        if not entries:
+            return await ctx.send(f"❌ No encontré títulos en `{archivo.filename}`.")
+
+        nuevos = await watchlist.add_many(entries, ctx.author.name)
+        repetidos = len(entries) - len(nuevos)
+        embed = discord.Embed(
+            description=f"{emotes.kase} **{len(nuevos)}** animes importados ({repetidos} ya estaban en la lista o repetidos).",
+            color=ROSA_PALO
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="export", description="Descarga la lista como archivo")
+    @app_commands.describe(formato="csv o json (por defecto csv)")
+    async def exportar(self, ctx: commands.Context, formato: Literal["csv", "json"] = "csv"):
+        rows = watchlist.list(False) + watchlist.list(True)
+        data = export_rows(rows, formato)
+        await ctx.send(f"📄 {len(rows)} animes en la lista.", file=discord.File(io.BytesIO(data), filename=f"watchlist.{formato}"))
+
+    @add.error
+    @delete.error
+    @importar.error
+    async def delete_error(self, ctx, error):
+        if isinstance(error, commands.MissingRole):
+            await ctx.send("Ups, necesitas el rol `purr` para realizar esta acción.", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Watchlist(bot))
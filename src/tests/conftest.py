@@ -0,0 +1,5 @@
+# Los módulos del bot se importan como en producción (desde src/): utils..., cogs...
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
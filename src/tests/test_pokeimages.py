@@ -0,0 +1,101 @@
+# Descargador de imágenes contra un servidor aiohttp local con dos PNG de prueba
+# que responde ETag / If-None-Match como el CDN.
+import os
+import sys
+import json
+import zlib
+import struct
+import asyncio
+import hashlib
+from aiohttp import web
+
+# pokeimages.py es un script que se corre desde src/utils
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils"))
+import pokeimages
+
+def png(rgb):
+    """PNG válido de 1x1 del color `rgb`."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(b"\x00" + bytes(rgb)))
+            + chunk(b"IEND", b""))
+
+IMAGES = {"/img/Pikachu.png": png((255, 220, 0)), "/img/Mr. Mime.png": png((255, 120, 160))}
+ENTRIES = [{"name": "Pikachu", "url": "https://cdn.example/img/Pikachu.png"},
+           {"name": "Mr. Mime", "url": "https://cdn.example/img/Mr. Mime.png"}]
+
+class Server:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.requests = []  # (ruta, status)
+        self.broken = set()  # Rutas que cortan la respuesta a la mitad
+        self.manifests = []  # Manifest en disco visto al pedir cada imagen
+
+    async def handle(self, request):
+        path = request.path
+        self.manifests.append(pokeimages.load_manifest(self.out_dir))
+        body = IMAGES.get(path)
+        if body is None:
+            return self.reply(path, web.Response(status=404))
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return self.reply(path, web.Response(status=304, headers={"ETag": etag}))
+        if path in self.broken:
+            # Promete el cuerpo completo y corta la conexión a medio camino
+            resp = web.StreamResponse(headers={"ETag": etag, "Content-Length": str(len(body))})
+            await resp.prepare(request)
+            await resp.write(body[:10])
+            request.transport.close()
+            self.requests.append((path, 200))
+            return resp
+        return self.reply(path, web.Response(body=body, content_type="image/png", headers={"ETag": etag}))
+
+    def reply(self, path, resp):
+        self.requests.append((path, resp.status))
+        return resp
+
+async def download(out_dir, server, **kwargs):
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await pokeimages.run(ENTRIES, out_dir, workers=1, base_url=f"http://127.0.0.1:{port}", **kwargs)
+    finally:
+        await runner.cleanup()
+
+def test_first_run_downloads_everything(tmp_path):
+    server = Server(tmp_path)
+    stats = asyncio.run(download(tmp_path, server))
+    assert (stats["downloaded"], stats["failed"]) == (2, 0)
+    assert (tmp_path / "pikachu.png").read_bytes() == IMAGES["/img/Pikachu.png"]
+    manifest = json.loads((tmp_path / pokeimages.MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert sorted(manifest) == sorted(f for f in os.listdir(tmp_path) if f != pokeimages.MANIFEST_NAME)
+
+def test_unchanged_images_are_not_downloaded_again(tmp_path):
+    asyncio.run(download(tmp_path, Server(tmp_path)))
+    server = Server(tmp_path)
+    stats = asyncio.run(download(tmp_path, server))
+    assert (stats["not_modified"], stats["downloaded"], stats["bytes"]) == (2, 0, 0)
+    assert [status for _, status in server.requests] == [304, 304]
+
+def test_manifest_is_saved_during_the_run_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(pokeimages, "RETRIES", 1)
+    server = Server(tmp_path)
+    server.broken.add("/img/Mr. Mime.png")
+    stats = asyncio.run(download(tmp_path, server, save_every=1))
+    assert (stats["downloaded"], stats["failed"]) == (1, 1)
+    # Al pedir la segunda imagen la primera ya estaba en disco: un SIGKILL ahí no la pierde
+    assert list(server.manifests[-1]) == ["pikachu.png"]
+    # La descarga cortada no deja archivos a medias
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".part")]
+
+    server = Server(tmp_path)
+    stats = asyncio.run(download(tmp_path, server, save_every=1))
+    assert (stats["not_modified"], stats["downloaded"], stats["failed"]) == (1, 1, 0)
+    assert server.requests == [("/img/Pikachu.png", 304), ("/img/Mr. Mime.png", 200)]
@@ -0,0 +1,47 @@
+# Cupos del pool de Supabase en utils/repository.py cuando una consulta pasa del timeout.
+import asyncio
+import threading
+import pytest
+from utils import repository
+
+class Blocked:
+    """Query cuyo execute() queda colgado en un hilo hasta que se suelta."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def execute(self):
+        self.started.set()
+        self.release.wait(5)
+        return "ok"
+
+class Instant:
+    def __init__(self):
+        self.ran = False
+
+    def execute(self):
+        self.ran = True
+        return "ok"
+
+@pytest.fixture
+def one_slot(monkeypatch):
+    monkeypatch.setattr(repository, "_semaphore", asyncio.Semaphore(1))
+
+def test_slot_is_held_until_the_thread_returns(one_slot):
+    async def scenario():
+        slow = Blocked()
+        with pytest.raises(asyncio.TimeoutError):
+            await repository.execute(slow, timeout=0.05, retries=0, probe=True)
+        assert slow.started.is_set()
+        # El hilo sigue ocupado: la siguiente no entra aunque quien esperaba ya se fue
+        assert repository._semaphore.locked()
+        fast = Instant()
+        with pytest.raises(asyncio.TimeoutError):
+            await repository.execute(fast, timeout=0.05, retries=0, probe=True)
+        assert not fast.ran  # Se rindió esperando cupo: nunca salió
+
+        slow.release.set()
+        assert await repository.execute(fast, timeout=1, retries=0, probe=True) == "ok"
+        assert not repository._semaphore.locked()
+    asyncio.run(scenario())
@@ -0,0 +1,45 @@
+# Memoria que reporta el registro de sesiones (!sessions).
+import asyncio
+from utils.sessions import SessionRegistry, deep_sizeof
+from classes.flip7_engine import Flip7Game
+
+class Guild:
+    __slots__ = ("id", "_members")
+
+    def __init__(self, members):
+        self.id = 1
+        self._members = {i: f"Miembro {i}" for i in range(members)}
+
+class Channel:
+    __slots__ = ("id", "guild")
+
+    def __init__(self, guild):
+        self.id = 10
+        self.guild = guild
+
+class Message:
+    __slots__ = ("id", "channel", "guild")
+
+    def __init__(self, guild):
+        self.id = 100
+        self.guild = guild
+        self.channel = Channel(guild)
+
+class View:
+    def __init__(self):
+        self.game = Flip7Game([1, 2], seed=7)
+        self.session_key = None
+
+def approx_bytes(members):
+    registry = SessionRegistry()
+    asyncio.run(registry.register(Message(Guild(members)), View(), "flip7", 1, 60))
+    return registry.stats()["approx_bytes"]
+
+def test_stats_measure_the_game_not_the_guild_cache():
+    # El mensaje lleva a su servidor; con 10.000 miembros el número no debe cambiar
+    assert approx_bytes(10_000) == approx_bytes(1)
+    assert approx_bytes(1) >= deep_sizeof(Flip7Game([1, 2], seed=7))
+
+def test_deep_sizeof_skips_discord_objects():
+    import discord
+    assert deep_sizeof(discord.Object(id=1)) == 0
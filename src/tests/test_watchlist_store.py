@@ -0,0 +1,67 @@
+# Réplica del watchlist contra el Supabase falso de los benchmarks, que corta
+# cada select en max-rows como PostgREST.
+import asyncio
+import pytest
+from benchmarks.fakes import FakeSupabase
+from utils import database, repository
+from utils.watchlist_store import WatchlistStore
+from classes.watchlist import title_choices
+
+ROWS = 2500  # Más de dos páginas de max-rows
+
+@pytest.fixture
+def db():
+    fake = FakeSupabase()
+    for i in range(ROWS):
+        fake.insert("watchlist", {"title": f"Anime {i}", "added_by": "test", "status": i % 2 == 0})
+    database.set_client(fake)
+    yield fake
+    database.set_client(None)
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_full_sync_reads_past_max_rows(db):
+    store = WatchlistStore(repository)
+    run(store.load())
+    assert store.count(False) + store.count(True) == ROWS
+    assert store.resolve(f"Anime {ROWS - 1}") is not None
+    # Una página por cada max-rows filas, más la corta del final
+    assert db.calls == ROWS // db.max_rows + 1
+
+def test_incremental_refresh_reads_past_max_rows(db):
+    store = WatchlistStore(repository)
+    run(store.load())
+    for row in db.tables["watchlist"][:1500]:
+        row.update(status=True, updated_at=db.now())
+    run(store.refresh())
+    assert store.count(True) == 1500 + sum(1 for i in range(1500, ROWS) if i % 2 == 0)
+
+def test_import_dedupes_against_rows_past_max_rows(db):
+    store = WatchlistStore(repository)
+    run(store.load())
+    entries = [(f"Anime {i}", False) for i in range(ROWS - 10, ROWS)] + [("Nuevo", False)]
+    inserted = run(store.add_many(entries, "test"))
+    assert [r["title"] for r in inserted] == ["Nuevo"]
+    assert len(db.tables["watchlist"]) == ROWS + 1
+
+def test_unloaded_store_reports_unavailable_instead_of_empty(db):
+    class Down:
+        def table(self, name):
+            raise ConnectionError("Supabase caído")
+
+    store = WatchlistStore(repository)
+    database.set_client(Down())  # La carga inicial falla
+    with pytest.raises(ConnectionError):
+        run(store.load())
+    assert not store.loaded
+    for read in (lambda: store.count(False), lambda: store.list(False), lambda: store.resolve("Anime 1")):
+        with pytest.raises(repository.DatabaseUnavailable):
+            read()
+    with pytest.raises(repository.DatabaseUnavailable):
+        run(store.add_many([("Anime 1", False)], "test"))
+    assert title_choices(store, "Anime") == []
+
+    database.set_client(db)  # Vuelve la DB: el reintento del cog carga y se sirve normal
+    run(store.load())
+    assert store.count(False) + store.count(True) == ROWS
@@ -0,0 +1,61 @@
+# src/utils/circuit_breaker.py
+# Corta las llamadas a un servicio caído para fallar al tiro en vez de que
+# cada comando espere su timeout. Se cierra solo cuando vuelve a responder.
+import time
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+class CircuitBreaker:
+    """Abierto tras `failure_threshold` fallos seguidos; tras `reset_timeout` deja pasar una prueba.
+
+    `on_change(estado_anterior, estado_nuevo)` se llama en cada transición.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, on_change=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False  # En HALF_OPEN solo una llamada a la vez prueba el servicio
+
+    def allow(self):
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            self._set(HALF_OPEN)
+        if self._trial:
+            return False
+        self._trial = True
+        return True
+
+    def retry_after(self):
+        """Segundos hasta que se vuelva a probar (0 si no está abierto)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        self.failures = 0
+        self._trial = False
+        if self.state != CLOSED:
+            self._set(CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            if self.state != OPEN:
+                self._set(OPEN)
+
+    def _set(self, state):
+        previous, self.state = self.state, state
+        if self.on_change is not None:
+            self.on_change(previous, state)
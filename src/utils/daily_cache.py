@@ -0,0 +1,71 @@
+# src/utils/daily_cache.py
+import time
+import asyncio
+
+class DailyCache:
+    """Caché en memoria del Pokémon diario, indexado por fecha (YYYY-MM-DD)."""
+
+    def __init__(self, loader, miss_ttl: float = 60):
+        self._loader = loader  # coroutine: fecha -> fila de daily_pokemon o None
+        self._entries = {}
+        self._missing = {}  # fecha -> momento en que no había fila (evita martillar la DB)
+        self._lock = asyncio.Lock()
+        self.miss_ttl = miss_ttl
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    async def get(self, date: str):
+        row = self._entries.get(date)
+        if row is not None:
+            self.hits += 1
+            return row
+
+        # Un solo query aunque lleguen muchos /unitedle a la vez
+        async with self._lock:
+            row = self._entries.get(date)
+            if row is not None:
+                self.hits += 1
+                return row
+
+            self.misses += 1
+            missing_since = self._missing.get(date)
+            if missing_since is not None and time.monotonic() - missing_since < self.miss_ttl:
+                return None
+            return await self._load(date)
+
+    async def prefetch(self, date: str):
+        """Carga `date` por adelantado; la fila queda lista para cuando cambie el día."""
+        async with self._lock:
+            return await self._load(date)
+
+    def evict_before(self, date: str):
+        for key in [k for k in self._entries if k < date]:
+            del self._entries[key]
+        for key in [k for k in self._missing if k < date]:
+            del self._missing[key]
+
+    def clear_missing(self):
+        """Olvida los días marcados como vacíos (p. ej. después de programar nuevos)."""
+        self._missing.clear()
+
+    async def _load(self, date):
+        self.loads += 1
+        row = await self._loader(date)
+        if row:
+            # Una sola asignación: los lectores ven la fila completa o nada
+            self._entries[date] = row
+            self._missing.pop(date, None)
+        else:
+            self._missing[date] = time.monotonic()
+        return row
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "hit_rate": self.hits / total if total else 0.0,
+            "dates": sorted(self._entries),
+        }
@@ -0,0 +1,52 @@
+# src/utils/daily_scheduler.py
+import random
+from datetime import date as Date, timedelta
+
+def plan_selections(pool_ids, history, start: Date, days: int, no_repeat: int, rng=None):
+    """Elige el Pokémon de cada fecha sin asignar en [start, start + days).
+
+    `history` es {"YYYY-MM-DD": pokemon_id} con lo que ya existe (pasado y futuro).
+    Un Pokémon no se repite dentro de `no_repeat` días; si el roster es muy chico
+    para eso, se elige el que lleva más tiempo sin salir.
+    Devuelve las filas nuevas, listas para un único insert en bloque.
+    """
+    rng = rng or random.Random()
+    pool_ids = list(pool_ids)
+    if not pool_ids:
+        return []
+
+    assigned = dict(history)
+    rows = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        key = day.isoformat()
+        if key in assigned:
+            continue
+
+        recent = {}
+        for back in range(1, no_repeat + 1):
+            prev = assigned.get((day - timedelta(days=back)).isoformat())
+            if prev is not None:
+                recent.setdefault(prev, back)
+        # Lo que viene después también cuenta: puede haber días ya asignados más adelante
+        for ahead in range(1, no_repeat + 1):
+            nxt = assigned.get((day + timedelta(days=ahead)).isoformat())
+            if nxt is not None:
+                recent.setdefault(nxt, ahead)
+
+        choices = [p for p in pool_ids if p not in recent]
+        if not choices:
+            oldest = max(recent.values())
+            choices = [p for p, dist in recent.items() if dist == oldest]
+
+        pick = rng.choice(choices)
+        assigned[key] = pick
+        rows.append({"date": key, "pokemon_id": pick})
+    return rows
+
+def days_covered(history, start: Date):
+    """Cuántos días seguidos desde `start` ya tienen Pokémon asignado."""
+    covered = 0
+    while (start + timedelta(days=covered)).isoformat() in history:
+        covered += 1
+    return covered
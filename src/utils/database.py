@@ -1,11 +1,48 @@
 # src/database.py
+# El cliente se crea la primera vez que se usa: importar supabase cuesta casi
+# medio segundo y no hace falta para registrar los comandos.
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
-URL = os.getenv("SUPABASE_URL")
-KEY = os.getenv("SUPABASE_KEY")
+# Un solo pool HTTP con keep-alive para todas las consultas; del mismo tamaño
+# que el pool de hilos de utils/repository.py
+DB_MAX_CONCURRENCY = int(os.getenv("DB_MAX_CONCURRENCY", "8"))
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "10"))
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "3"))
+DB_KEEPALIVE_EXPIRY = float(os.getenv("DB_KEEPALIVE_EXPIRY", "60"))
 
-# Creamos la instancia aquí
-supabase: Client = create_client(URL, KEY)
\ No newline at end of file
+_client = None
+_lock = threading.Lock()
+
+def _http_client():
+    import httpx
+    return httpx.Client(
+        timeout=httpx.Timeout(DB_TIMEOUT, connect=DB_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=DB_MAX_CONCURRENCY,
+            max_keepalive_connections=DB_MAX_CONCURRENCY,
+            keepalive_expiry=DB_KEEPALIVE_EXPIRY,
+        ),
+        follow_redirects=True,
+    )
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:  # repository llama desde varios hilos del pool
+            if _client is None:
+                from supabase import create_client, ClientOptions
+                options = ClientOptions(httpx_client=_http_client(), postgrest_client_timeout=DB_TIMEOUT)
+                _client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"), options=options)
+    return _client
+
+def set_client(client):
+    """Reemplaza el cliente (p. ej. por el falso en memoria de src/benchmarks/fakes.py)."""
+    global _client
+    _client = client
+
+def __getattr__(name):
+    # Compatibilidad con `from utils.database import supabase`
+    if name == "supabase":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,34 +1,81 @@
-import discord
+# Nombre en el código -> nombre del emoji en Discord (solo los que difieren)
+ALIASES = {"oshahappy": "emoji_52"}
 
-kase = kasen = angii = angi = bleh = blehh = blehhhh = None
-mrballs = mrpenis = mrtitties = pn = pp = happy = mm = None
-tomatewn = hm = oo = trite = jojojo = oshahappy = okk = tite = None
+# Texto que se usa mientras el emoji no está disponible (antes de on_ready o
+# si lo borran del servidor). Todos los nombres conocidos tienen uno.
+FALLBACKS = {
+    "kase": "🌸", "kasen": "🌸", "angii": "😤", "angi": "😠",
+    "bleh": "😛", "blehh": "😛", "blehhhh": "😛",
+    "mrballs": "🎲", "mrpenis": "🎲", "mrtitties": "🎲",
+    "pn": "😳", "pp": "😳", "happy": "😊", "mm": "🤔",
+    "tomatewn": "🍅", "hm": "🤔", "oo": "😮", "trite": "😢",
+    "jojojo": "😂", "oshahappy": "🎉", "okk": "👌", "tite": "😔",
+}
+
+class EmoteRegistry:
+    """Índice nombre -> emoji de todos los servidores del bot.
+
+    Si hay dos emojis con el mismo nombre gana el primero que se vio, igual
+    que `discord.utils.get(bot.emojis, name=...)`.
+    """
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_guild = {}  # guild_id -> {nombre: emoji}
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def load(self, emojis):
+        """Reconstruye el índice en una sola pasada."""
+        by_name, by_guild = {}, {}
+        for emoji in emojis:
+            by_name.setdefault(emoji.name, emoji)
+            by_guild.setdefault(emoji.guild_id, {}).setdefault(emoji.name, emoji)
+        self._by_name, self._by_guild = by_name, by_guild
+
+    def update_guild(self, guild_id, emojis):
+        """Reemplaza los emojis de un servidor (on_guild_emojis_update / join / remove)."""
+        old = self._by_guild.pop(guild_id, {})
+        new = {}
+        for emoji in emojis:
+            new.setdefault(emoji.name, emoji)
+        if new:
+            self._by_guild[guild_id] = new
+
+        for name, emoji in old.items():
+            if self._by_name.get(name) is emoji:
+                del self._by_name[name]
+                # Si otro servidor tiene uno con el mismo nombre, pasa a ser ese
+                for other in self._by_guild.values():
+                    if name in other:
+                        self._by_name[name] = other[name]
+                        break
+        for name, emoji in new.items():
+            current = self._by_name.get(name)
+            if current is None or current.guild_id == guild_id:
+                self._by_name[name] = emoji
+
+    def get(self, name, default=None):
+        return self._by_name.get(ALIASES.get(name, name), default)
+
+    def resolve(self, name):
+        """El emoji, o su texto de respaldo si aún no está disponible."""
+        emoji = self.get(name)
+        if emoji is not None:
+            return emoji
+        return FALLBACKS.get(name, "")
+
+registry = EmoteRegistry()
 
 def setup_emotes(bot):
-    """Esta función asignará los emojis a las variables globales"""
-    global kase, kasen, angii, angi, bleh, blehh, blehhhh
-    global mrballs, mrpenis, mrtitties, pn, pp, happy, mm
-    global tomatewn, oo, trite, jojojo, oshahappy, okk, tite, hm
-
-    kase = discord.utils.get(bot.emojis, name="kase")
-    kasen = discord.utils.get(bot.emojis, name="kasen")
-    angii = discord.utils.get(bot.emojis, name="angii")
-    angi = discord.utils.get(bot.emojis, name="angi")
-    bleh = discord.utils.get(bot.emojis, name="bleh")
-    blehh = discord.utils.get(bot.emojis, name="blehh")
-    blehhhh = discord.utils.get(bot.emojis, name="blehhhh")
-    mrballs = discord.utils.get(bot.emojis, name="mrballs")
-    mrpenis = discord.utils.get(bot.emojis, name="mrpenis")
-    mrtitties = discord.utils.get(bot.emojis, name="mrtitties")
-    pn = discord.utils.get(bot.emojis, name="pn")
-    pp = discord.utils.get(bot.emojis, name="pp")
-    happy = discord.utils.get(bot.emojis, name="happy")
-    mm = discord.utils.get(bot.emojis, name="mm")
-    tomatewn = discord.utils.get(bot.emojis, name="tomatewn")
-    oo = discord.utils.get(bot.emojis, name="oo")
-    trite = discord.utils.get(bot.emojis, name="trite")
-    jojojo = discord.utils.get(bot.emojis, name="jojojo")
-    oshahappy = discord.utils.get(bot.emojis, name="emoji_52")
-    okk = discord.utils.get(bot.emojis, name="okk")
-    tite = discord.utils.get(bot.emojis, name="tite")
-    hm = discord.utils.get(bot.emojis, name="hm")
+    registry.load(bot.emojis)
+
+def update_guild(guild, emojis):
+    registry.update_guild(guild.id, emojis)
+
+def __getattr__(name):
+    # `emotes.kase` se resuelve al usarlo: nunca es None
+    if name in FALLBACKS:
+        return registry.resolve(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
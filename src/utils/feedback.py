@@ -0,0 +1,68 @@
+# src/utils/feedback.py
+import numpy as np
+
+GREEN, YELLOW, GRAY = "🟩", "🟨", "⬜"
+
+def generate_feedback(guess, target):
+    """Feedback estilo Wordle de `guess` contra `target` (ambos en mayúsculas)."""
+    result = [GRAY] * len(target)
+    target_list = list(target)
+
+    for i in range(min(len(guess), len(target))):
+        if guess[i] == target[i]:
+            result[i] = GREEN
+            target_list[i] = None
+
+    for i in range(min(len(guess), len(target))):
+        if result[i] == GRAY and guess[i] in target_list:
+            result[i] = YELLOW
+            target_list[target_list.index(guess[i])] = None
+    return "".join(result)
+
+class FeedbackMatrix:
+    """Feedback precalculado de cada guess contra cada objetivo posible del roster.
+
+    `matrix[g, t]` es el id del patrón que produce el guess g contra el objetivo t;
+    `patterns[id]` es el string de cuadritos correspondiente.
+    """
+
+    def __init__(self, names):
+        self.names = [n.upper() for n in names]
+        self.index = {n: i for i, n in enumerate(self.names)}
+
+        size = len(self.names)
+        pattern_ids = {}
+        matrix = np.empty((size, size), dtype=np.uint16)
+        for g, guess in enumerate(self.names):
+            for t, target in enumerate(self.names):
+                pattern = generate_feedback(guess, target)
+                matrix[g, t] = pattern_ids.setdefault(pattern, len(pattern_ids))
+
+        self.matrix = matrix
+        self.pattern_ids = pattern_ids
+        self.patterns = list(pattern_ids)
+
+    def feedback(self, guess, target):
+        g = self.index.get(guess)
+        t = self.index.get(target)
+        if g is None or t is None:
+            return generate_feedback(guess, target)
+        return self.patterns[self.matrix[g, t]]
+
+    def candidates(self, attempts):
+        """Índices del roster que siguen siendo compatibles con [(guess, feedback), ...]."""
+        mask = np.ones(len(self.names), dtype=bool)
+        for guess, feedback in attempts:
+            g = self.index.get(guess)
+            if g is None:
+                continue
+            pattern = self.pattern_ids.get(feedback)
+            if pattern is None:
+                # Un patrón que ningún objetivo del roster puede producir
+                mask[:] = False
+                break
+            mask &= self.matrix[g] == pattern
+        return np.flatnonzero(mask)
+
+    def count_candidates(self, attempts):
+        return len(self.candidates(attempts))
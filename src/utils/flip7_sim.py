@@ -0,0 +1,97 @@
+# Simulador Monte Carlo de Flip 7 sobre el motor headless (classes/flip7_engine.py).
+# Uso (desde src/): python -m utils.flip7_sim --games 1000000 --workers 8
+import os
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from classes.flip7_engine import Flip7Game
+
+# Cada estrategia decide, mirando la mano actual, si sacar otra carta
+STRATEGIES = {
+    "3 cartas": lambda hand: len(hand) < 3,
+    "4 cartas": lambda hand: len(hand) < 4,
+    "5 cartas": lambda hand: len(hand) < 5,
+    "20 puntos": lambda hand: hand.total < 20,
+    "30 puntos": lambda hand: hand.total < 30,
+}
+
+def play(names, games, seed):
+    """Juega `games` partidas con un jugador por estrategia. Devuelve contadores sumables."""
+    strategies = [STRATEGIES[n] for n in names]
+    busts = Counter()
+    wins = Counter()
+    scores = {n: Counter() for n in names}
+
+    rng = random.Random(seed)
+    players = range(len(names))
+    for _ in range(games):
+        game = Flip7Game(players, rng=rng)
+        while not game.finished:
+            if strategies[game.current_player](game.current_hand):
+                game.flip()
+            else:
+                game.stay()
+
+        for player, score in game.final_scores.items():
+            name = names[player]
+            scores[name][score] += 1
+            if score == 0:
+                busts[name] += 1
+        winner = game.winner()
+        if winner is not None:
+            wins[names[winner]] += 1
+    return busts, wins, scores
+
+def simulate(names, games, workers=None, seed=0):
+    workers = workers or os.cpu_count()
+    chunk = -(-games // workers)
+    jobs = [(min(chunk, games - i), seed + i) for i in range(0, games, chunk)]
+
+    busts, wins = Counter(), Counter()
+    scores = {n: Counter() for n in names}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play, names, count, job_seed) for count, job_seed in jobs]
+        for future in futures:
+            b, w, s = future.result()
+            busts.update(b)
+            wins.update(w)
+            for n in names:
+                scores[n].update(s[n])
+    return busts, wins, scores
+
+def percentile(counter, q):
+    total = sum(counter.values())
+    seen = 0
+    for value in sorted(counter):
+        seen += counter[value]
+        if seen >= q * total:
+            return value
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simula partidas de Flip 7 por estrategia.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    busts, wins, scores = simulate(args.strategies, args.games, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.games:,} partidas en {elapsed:.2f}s ({args.games / elapsed:,.0f} partidas/s)\n")
+    print(f"{'estrategia':<12} {'bust':>7} {'victorias':>10} {'media':>7} {'p50':>5} {'p90':>5}")
+    for name in args.strategies:
+        dist = scores[name]
+        played = sum(dist.values())
+        mean = sum(v * c for v, c in dist.items()) / played
+        print(f"{name:<12} {busts[name] / played:>7.1%} {wins[name] / args.games:>10.1%} "
+              f"{mean:>7.2f} {percentile(dist, 0.5):>5} {percentile(dist, 0.9):>5}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# src/utils/gateway.py
+# Qué pide el bot al gateway y qué guarda en caché. En modo "lean" solo se
+# suscribe a los eventos que usan sus funciones y no cachea miembros ni mensajes.
+import os
+import discord
+
+GATEWAY_MODE = os.getenv("GATEWAY_MODE", "lean").lower()  # "lean" o "full" (el comportamiento anterior)
+# Mensajes que se guardan en bot.cached_messages en modo lean (0 = ninguno)
+LEAN_MAX_MESSAGES = int(os.getenv("LEAN_MAX_MESSAGES", "0"))
+
+def lean_intents():
+    """Solo lo que usa el bot:
+
+    - guilds: caché de servidores y canales (restaurar partidas, on_guild_join/remove)
+    - guild_messages, dm_messages y message_content: comandos con prefijo p!
+    - emojis_and_stickers: registro de emotes y on_guild_emojis_update
+
+    Los slash commands y botones llegan como interacciones, sin intent. El autor
+    de cada mensaje/interacción ya viene como Member en el payload, así que
+    has_role funciona sin el intent de miembros.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+    intents.emojis_and_stickers = True
+    return intents
+
+def client_options(mode=GATEWAY_MODE):
+    """kwargs de intents y cachés para commands.Bot según el modo."""
+    if mode == "full":
+        intents = discord.Intents.default()
+        intents.message_content = True
+        return {"intents": intents}
+    if mode != "lean":
+        raise ValueError(f"GATEWAY_MODE desconocido: {mode!r} (usa 'lean' o 'full')")
+    return {
+        "intents": lean_intents(),
+        # Sin caché de miembros (salvo el propio bot, que discord.py guarda siempre)
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "max_messages": LEAN_MAX_MESSAGES or None,
+        # No pedimos la lista de miembros al conectar: sin caché no sirve y retrasa on_ready
+        "chunk_guilds_at_startup": False,
+    }
@@ -0,0 +1,70 @@
+# src/utils/hint_pack.py
+# Archivo empaquetado con las pistas visuales de Unitedle:
+#   MAGIC | largo del índice (4 bytes, big endian) | índice JSON | imágenes PNG seguidas
+# El índice es {"pokemon": {"1": [offset, largo], "2": [...], ...}} con offsets
+# relativos al inicio de las imágenes.
+import os
+import json
+import mmap
+import struct
+
+MAGIC = b"PKHINT1\n"
+
+def write_pack(path, entries):
+    """`entries` es {nombre: {nivel: bytes_png}}. Escribe el paquete de forma atómica."""
+    index = {}
+    blobs = []
+    offset = 0
+    for name in sorted(entries):
+        index[name] = {}
+        for tier in sorted(entries[name]):
+            data = entries[name][tier]
+            index[name][str(tier)] = [offset, len(data)]
+            blobs.append(data)
+            offset += len(data)
+
+    header = json.dumps(index, separators=(",", ":")).encode()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack(">I", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+
+class HintPack:
+    """Lectura del paquete vía mmap: un solo open al cargar y cero copias de disco por pista."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} no es un paquete de pistas válido")
+
+        (header_len,) = struct.unpack(">I", self._mmap[len(MAGIC):len(MAGIC) + 4])
+        start = len(MAGIC) + 4
+        self.index = json.loads(self._mmap[start:start + header_len])
+        self._data_start = start + header_len
+
+    @classmethod
+    def open_if_exists(cls, path):
+        return cls(path) if os.path.exists(path) else None
+
+    def tiers(self, name):
+        return sorted(int(t) for t in self.index.get(name, {}))
+
+    def get(self, name, tier):
+        """memoryview con el PNG de `name` en el nivel `tier`, o None."""
+        entry = self.index.get(name, {}).get(str(tier))
+        if entry is None:
+            return None
+        offset, length = entry
+        start = self._data_start + offset
+        return memoryview(self._mmap)[start:start + length]
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
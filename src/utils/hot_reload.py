@@ -0,0 +1,70 @@
+# src/utils/hot_reload.py
+# Recarga de cogs sin reiniciar el proceso: el gateway, las partidas en curso
+# y los singletons de utils/ (watchlist, sesiones, cola de salida) siguen
+# vivos. Cada cog deja su estado en bot.cog_state al descargarse y la
+# instancia nueva lo retoma en su __init__.
+import os
+import sys
+import time
+import importlib
+
+EXTENSIONS = ("cogs.unitedle", "cogs.watchlist", "cogs.flip7")
+
+# Con HOT_RELOAD=1 el bot vigila los archivos de los cogs y los recarga al guardarlos
+HOT_RELOAD = os.getenv("HOT_RELOAD", "0") == "1"
+HOT_RELOAD_INTERVAL = float(os.getenv("HOT_RELOAD_INTERVAL", "2"))
+
+def resolve_extension(name):
+    """'unitedle' o 'cogs.unitedle' -> 'cogs.unitedle'; ValueError si no existe."""
+    ext = name if name.startswith("cogs.") else f"cogs.{name}"
+    if ext not in EXTENSIONS:
+        raise ValueError(f"No existe el módulo `{name}`. Opciones: {', '.join(e[5:] for e in EXTENSIONS)}")
+    return ext
+
+def dependencies(ext):
+    """Módulos sin estado que se recargan junto con la extensión (su RELOAD_MODULES)."""
+    module = sys.modules.get(ext)
+    return tuple(getattr(module, "RELOAD_MODULES", ()))
+
+async def reload_extension(bot, ext):
+    """Recarga las dependencias y luego el cog. Devuelve los segundos que tomó.
+
+    Si el código nuevo falla al cargar, discord.py vuelve a montar la versión
+    anterior (que retoma su estado de bot.cog_state) y relanza el error.
+    """
+    start = time.perf_counter()
+    for name in dependencies(ext):
+        if name in sys.modules:
+            importlib.reload(sys.modules[name])
+    await bot.reload_extension(ext)
+    return time.perf_counter() - start
+
+class FileWatcher:
+    """Detecta por mtime qué extensiones cambiaron desde la última revisión."""
+
+    def __init__(self, extensions=EXTENSIONS):
+        self.extensions = extensions
+        self._mtimes = {}
+        self.changed()  # Línea base: lo que está cargado ahora
+
+    def _files(self, ext):
+        for name in (ext,) + dependencies(ext):
+            path = getattr(sys.modules.get(name), "__file__", None)
+            if path:
+                yield path
+
+    def changed(self):
+        result = []
+        for ext in self.extensions:
+            dirty = False
+            for path in self._files(ext):
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                if self._mtimes.setdefault(path, mtime) != mtime:
+                    self._mtimes[path] = mtime
+                    dirty = True
+            if dirty:
+                result.append(ext)
+        return result
@@ -2,10 +2,13 @@ import os
 
 folder_path = './images'
 
+def normalize_filename(filename):
+    return filename.lower().replace(' ', '-')
+
 def force_normalize(directory):
     for filename in os.listdir(directory):
         if filename.endswith(".png"):
-            new_name = filename.lower().replace(' ', '-')
+            new_name = normalize_filename(filename)
 
             if filename != new_name:
                 old_file = os.path.join(directory, filename)
@@ -1,23 +1,123 @@
-from supabase import create_client
+# Sube las imágenes de images/ al bucket `unitepkmns` y asigna image_url en pokemon_unite.
+# Uso: python image_uploader.py [--images images] [--workers 8]
 import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from image_normalizer import normalize_filename
 
-load_dotenv()
+BUCKET = "unitepkmns"
+UPLOAD_MANIFEST = "uploaded.json"
 
-TOKEN = os.getenv("DISCORD_TOKEN")
-URL = os.getenv("SUPABASE_URL")
-KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(URL, KEY)
+class SupabaseAssetBackend:
+    """Storage + tabla pokemon_unite. Se puede cambiar por uno falso para probar sin red."""
 
-PROJECT_REF = os.getenv("PROJECT_REF")
+    def __init__(self, client, project_ref, bucket=BUCKET):
+        self.client = client
+        self.project_ref = project_ref
+        self.bucket = bucket
 
-pokemons = supabase.table("pokemon_unite").select("*").execute().data
+    def list_pokemon(self):
+        return self.client.table("pokemon_unite").select("*").execute().data
 
-for p in pokemons:
+    def upload(self, filename, data):
+        self.client.storage.from_(self.bucket).upload(
+            filename, data, {"content-type": "image/png", "upsert": "true"}
+        )
 
-    filename = f"{p['name'].lower().replace(' ', '-')}.png"
-    
-    public_url = f"https://{PROJECT_REF}.supabase.co/storage/v1/object/public/unitepkmns/{filename}"
-    
-    supabase.table("pokemon_unite").update({"image_url": public_url}).eq("id", p['id']).execute()
-    print(f"✅ Asignada imagen para {p['name']}: {public_url}")
\ No newline at end of file
+    def public_url(self, filename):
+        return f"https://{self.project_ref}.supabase.co/storage/v1/object/public/{self.bucket}/{filename}"
+
+    def upsert_pokemon(self, rows):
+        self.client.table("pokemon_unite").upsert(rows, on_conflict="id").execute()
+
+def file_sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def load_manifest(path):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def sync(backend, images_dir="images", workers=8):
+    start = time.perf_counter()
+    manifest_path = os.path.join(images_dir, UPLOAD_MANIFEST)
+    manifest = load_manifest(manifest_path)
+    pokemons = backend.list_pokemon()
+
+    # 1. Subir solo lo que cambió desde la última vez
+    pending = []
+    for p in pokemons:
+        filename = normalize_filename(f"{p['name']}.png")
+        path = os.path.join(images_dir, filename)
+        if not os.path.exists(path):
+            print(f"⚠️ Falta la imagen de {p['name']} ({filename})")
+            continue
+        digest = file_sha256(path)
+        if manifest.get(filename) != digest:
+            pending.append((filename, path, digest))
+
+    def upload(item):
+        filename, path, digest = item
+        with open(path, "rb") as f:
+            backend.upload(filename, f.read())
+        return filename, digest
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(upload, item) for item in pending]
+        for future, (filename, _, _) in zip(futures, pending):
+            try:
+                name, digest = future.result()
+                manifest[name] = digest
+                print(f"✅ Subida {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ Error al subir {filename}: {e}")
+    save_manifest(manifest_path, manifest)
+
+    # 2. Un solo upsert con todas las image_url que no coinciden
+    updates = []
+    for p in pokemons:
+        url = backend.public_url(normalize_filename(f"{p['name']}.png"))
+        if p.get('image_url') != url:
+            updates.append({**p, "image_url": url})
+    if updates:
+        backend.upsert_pokemon(updates)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(pending) - failed} imágenes subidas, {failed} fallidas, "
+          f"{len(updates)} image_url actualizadas en {elapsed:.2f}s.")
+    return {"uploaded": len(pending) - failed, "failed": failed, "updated": len(updates)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sincroniza las imágenes del roster con Supabase.")
+    parser.add_argument("--images", default="images")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    from supabase import create_client
+    load_dotenv()
+    client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    backend = SupabaseAssetBackend(client, os.getenv("PROJECT_REF"))
+
+    stats = sync(backend, args.images, args.workers)
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
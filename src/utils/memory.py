@@ -0,0 +1,124 @@
+# src/utils/memory.py
+# Reporte de memoria por subsistema con tracemalloc, para dimensionar el
+# contenedor con números reales. Solo librería estándar: se importa antes que
+# todo lo demás para que tracemalloc vea también las importaciones.
+import os
+import sys
+import sysconfig
+import tracemalloc
+
+# TRACEMALLOC=1 activa el rastreo desde el arranque (cuesta CPU y ~30% más de memoria)
+TRACEMALLOC = os.getenv("TRACEMALLOC", "0") == "1"
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "1"))
+
+_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__))).replace("\\", "/") + "/"
+_STDLIB = sysconfig.get_paths()["stdlib"].replace("\\", "/") + "/"
+
+# Primer match gana. Código propio: rutas relativas a src/
+LOCAL = (
+    ("unitedle", ("cogs/unitedle.py", "utils/feedback.py", "utils/roster.py", "utils/daily_cache.py",
+                  "utils/daily_scheduler.py", "utils/unitedle_stats.py", "utils/hint_pack.py",
+                  "utils/render_hints.py", "utils/pokeimages.py")),
+    ("watchlist", ("cogs/watchlist.py", "classes/watchlist.py", "utils/watchlist_", "utils/ngram_index.py")),
+    ("flip7", ("cogs/flip7.py", "classes/flip7", "utils/sessions.py", "utils/flip7_sim.py")),
+)
+# Librerías: por nombre de paquete en la ruta
+LIBRARIES = (
+    ("discord.py", ("/discord/",)),
+    ("aiohttp", ("/aiohttp/", "/yarl/", "/multidict/", "/frozenlist/")),
+    ("supabase/httpx", ("/supabase/", "/postgrest/", "/supabase_auth/", "/gotrue/", "/storage3/",
+                        "/realtime/", "/supabase_functions/", "/httpx/", "/httpcore/", "/h2/", "/pydantic")),
+    ("numpy", ("/numpy/",)),
+    # Con un frame, el bytecode de cada módulo importado queda a nombre de importlib
+    ("bytecode", ("<frozen ",)),
+)
+BOT = "bot"  # Resto de src/: bot.py, métricas, DB, emotes...
+STDLIB = "stdlib"
+OTHER = "otros"
+
+def start(frames=TRACEMALLOC_FRAMES):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+def start_from_env():
+    if TRACEMALLOC:
+        start()
+
+def subsystem(filename):
+    path = filename.replace("\\", "/")
+    if path.startswith(_SRC):
+        local = path[len(_SRC):]
+        return next((name for name, prefixes in LOCAL if local.startswith(prefixes)), BOT)
+    name = next((name for name, prefixes in LIBRARIES if any(p in path for p in prefixes)), None)
+    if name is not None:
+        return name
+    return STDLIB if path.startswith(_STDLIB) and "-packages/" not in path else OTHER
+
+def by_subsystem(snapshot):
+    """{subsistema: (bytes, bloques)} agrupando las estadísticas por archivo."""
+    totals = {}
+    for stat in snapshot.statistics("filename"):
+        name = subsystem(stat.traceback[0].filename)
+        size, count = totals.get(name, (0, 0))
+        totals[name] = (size + stat.size, count + stat.count)
+    return dict(sorted(totals.items(), key=lambda kv: kv[1][0], reverse=True))
+
+def rss_bytes():
+    """RSS actual del proceso (None si no se puede leer)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource  # Fuera de Linux: el máximo histórico, no el actual
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def _mb(n):
+    return f"{n / 1_048_576:.1f} MB"
+
+def cache_counts(bot):
+    """Tamaño de las cachés de discord.py, lo que más cambia entre GATEWAY_MODE lean y full."""
+    return {
+        "servidores": len(bot.guilds),
+        "usuarios": len(bot.users),
+        "miembros": sum(len(g.members) for g in bot.guilds),
+        "mensajes": len(bot.cached_messages),
+        "emojis": len(bot.emojis),
+    }
+
+def report(bot, top=5):
+    """Texto del reporte: RSS, cachés de discord.py y, si se rastrea, desglose por subsistema."""
+    rss = rss_bytes()
+    lines = [f"RSS: {_mb(rss) if rss is not None else '¿?'}"]
+    lines.append("Cachés: " + ", ".join(f"{k} {v}" for k, v in cache_counts(bot).items()))
+
+    if not tracemalloc.is_tracing():
+        lines.append("tracemalloc apagado: arranca con TRACEMALLOC=1 para el desglose por subsistema.")
+        return "\n".join(lines)
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),  # Sin lo que asigna el propio tracemalloc.py
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    lines.append(f"Python (tracemalloc): {_mb(current)} ahora, {_mb(peak)} pico, "
+                 f"{_mb(tracemalloc.get_tracemalloc_memory())} del propio rastreo")
+    lines.append("")
+    totals = by_subsystem(snapshot)
+    traced = sum(size for size, _ in totals.values()) or 1
+    lines.append(f"{'subsistema':<16}{'memoria':>10}{'%':>6}{'bloques':>10}")
+    for name, (size, count) in totals.items():
+        lines.append(f"{name:<16}{_mb(size):>10}{size / traced:>6.0%}{count:>10}")
+
+    if top:
+        lines.append("")
+        lines.append(f"Top {top} líneas:")
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            lines.append(f"{_mb(stat.size):>9}  {frame.filename.replace(_SRC, '')}:{frame.lineno}")
+    return "\n".join(lines)
@@ -0,0 +1,257 @@
+# src/utils/metrics.py
+# Métricas en memoria con formato de texto de Prometheus, servidas en
+# localhost. Registrar una observación es un bisect y dos sumas, sin locks:
+# todo se llama desde el event loop.
+import os
+import re
+import json
+import time
+import asyncio
+import aiohttp
+from aiohttp import web
+from bisect import bisect_left
+from datetime import datetime, timezone
+from discord import app_commands
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))  # 0 = sin endpoint
+SLOW_CALL_MS = float(os.getenv("SLOW_CALL_MS", "1000"))
+LOOP_LAG_INTERVAL = 0.5
+ACK_DEADLINE = 3.0  # Discord invalida la interacción si no respondemos en 3 s
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ACK_BUCKETS = (0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values, extra=""):
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+class Gauge(Counter):
+    def set(self, value, *labels):
+        self._values[labels] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [conteo por bucket (no acumulado)..., +Inf, suma]
+
+    def observe(self, value, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += n
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class Metrics:
+    def __init__(self, slow_call_ms=SLOW_CALL_MS):
+        self.slow_call_ms = slow_call_ms
+        self.command_latency = Histogram(
+            "pascualkyu_command_seconds", "Duración de comandos (slash y prefijo)", ("command", "status"))
+        self.view_latency = Histogram(
+            "pascualkyu_view_callback_seconds", "Duración de callbacks de botones/selects", ("view", "item", "status"))
+        self.db_latency = Histogram(
+            "pascualkyu_db_seconds", "Duración de llamadas a Supabase", ("table", "method"))
+        self.db_errors = Counter(
+            "pascualkyu_db_errors_total", "Llamadas a Supabase que fallaron", ("table", "method", "error"))
+        self.loop_lag = Histogram(
+            "pascualkyu_event_loop_lag_seconds", "Retraso del event loop sobre el tick esperado", buckets=LAG_BUCKETS)
+        self.loop_lag_last = Gauge("pascualkyu_event_loop_lag_last_seconds", "Último retraso medido del event loop")
+        self.db_retries = Counter("pascualkyu_db_retries_total", "Reintentos de lecturas a Supabase", ("table",))
+        self.db_rejected = Counter(
+            "pascualkyu_db_rejected_total", "Llamadas cortadas por el circuit breaker sin llegar a Supabase", ("table",))
+        self.db_up = Gauge("pascualkyu_db_up", "1 si el último health check a Supabase respondió")
+        self.db_breaker_state = Gauge("pascualkyu_db_breaker_state", "0 cerrado, 1 semiabierto, 2 abierto")
+        self.ack_latency = Histogram(
+            "pascualkyu_interaction_ack_seconds", "Tiempo desde que se crea la interacción hasta responderla",
+            ("status",), buckets=ACK_BUCKETS)
+        self.ack_late = Counter(
+            "pascualkyu_interaction_ack_late_total", f"Respuestas a interacciones después de {ACK_DEADLINE:.0f} s")
+        self._families = [
+            self.command_latency, self.view_latency, self.db_latency, self.db_errors,
+            self.db_retries, self.db_rejected, self.db_up, self.db_breaker_state,
+            self.loop_lag, self.loop_lag_last, self.ack_latency, self.ack_late,
+        ]
+        self._lag_task = None
+        self._runner = None
+
+    # --- REGISTRO ---
+    def observe_command(self, name, seconds, ok):
+        status = "ok" if ok else "error"
+        self.command_latency.observe(seconds, name, status)
+        self._maybe_slow("command", seconds, command=name, status=status)
+
+    def observe_view(self, view, item, seconds, ok):
+        status = "ok" if ok else "error"
+        self.view_latency.observe(seconds, view, item, status)
+        self._maybe_slow("view", seconds, view=view, item=item, status=status)
+
+    def observe_db(self, table, method, seconds, error=None):
+        self.db_latency.observe(seconds, table, method)
+        if error is not None:
+            self.db_errors.inc(table, method, type(error).__name__)
+            self._maybe_slow("db", seconds, table=table, method=method, error=type(error).__name__)
+        else:
+            self._maybe_slow("db", seconds, table=table, method=method)
+
+    def observe_ack(self, seconds, status):
+        self.ack_latency.observe(seconds, str(status))
+        if seconds > ACK_DEADLINE:
+            self.ack_late.inc()
+            self._maybe_slow("ack", seconds, status=status, force=True)
+
+    def _maybe_slow(self, kind, seconds, force=False, **fields):
+        if force or seconds * 1000 >= self.slow_call_ms:
+            # Una línea JSON por llamada lenta para poder filtrarlas con grep/jq
+            print(json.dumps({"slow_call": kind, "ms": round(seconds * 1000, 1), **fields}, ensure_ascii=False))
+
+    def render(self):
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    # --- EVENT LOOP ---
+    def start(self):
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._measure_lag())
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = max(0.0, loop.time() - expected)
+            self.loop_lag.observe(lag)
+            self.loop_lag_last.set(lag)
+
+    # --- HTTP ---
+    async def serve(self, host=METRICS_HOST, port=METRICS_PORT):
+        """Expone /metrics en host:port (solo localhost por defecto)."""
+        if not port or self._runner is not None:
+            return
+
+        async def handle(request):
+            return web.Response(text=self.render(), content_type="text/plain", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        print(f"📈 Métricas en http://{host}:{port}/metrics")
+
+    async def close(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+metrics = Metrics()
+
+# --- INTEGRACIONES ---
+_REST_PATH = re.compile(r"/rest/v1/([^?]+)")
+
+def query_labels(query):
+    """('watchlist', 'GET') o ('rpc/submit_unitedle_guess', 'POST') a partir de un query builder."""
+    request = getattr(query, "request", None)
+    match = _REST_PATH.search(str(getattr(request, "path", "")))
+    method = getattr(request, "http_method", "?")
+    return (match.group(1) if match else "desconocido", str(getattr(method, "value", method)))
+
+_CALLBACK_PATH = re.compile(r"/interactions/(\d+)/[^/]+/callback")
+_DISCORD_EPOCH_MS = 1420070400000
+
+def interaction_trace_config():
+    """TraceConfig para el cliente HTTP de discord.py: mide cuándo se confirma cada interacción.
+
+    La hora de creación sale del snowflake del id, así que incluye lo que tardó
+    el gateway en entregarla; es lo mismo que cuenta Discord para los 3 s.
+    """
+    async def on_request_end(session, ctx, params):
+        match = _CALLBACK_PATH.search(params.url.path)
+        if match is None:
+            return
+        created_ms = (int(match.group(1)) >> 22) + _DISCORD_EPOCH_MS
+        elapsed = datetime.now(timezone.utc).timestamp() - created_ms / 1000
+        metrics.observe_ack(max(0.0, elapsed), params.response.status)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+def item_name(item):
+    """Nombre legible de un botón/select: el de su callback decorado o su custom_id."""
+    callback = getattr(item.callback, "callback", None)
+    return getattr(callback, "__name__", None) or getattr(item, "custom_id", None) or type(item).__name__
+
+def observe_interaction(interaction, ok):
+    """Cierra la medición que abrió InstrumentedTree.interaction_check."""
+    start = interaction.extras.pop("metrics_start", None)
+    if start is None:
+        return
+    command = interaction.command
+    name = command.qualified_name if command is not None else "desconocido"
+    metrics.observe_command(name, time.perf_counter() - start, ok)
+
+class InstrumentedTree(app_commands.CommandTree):
+    """CommandTree que mide cada slash command (también los híbridos).
+
+    Los éxitos se cierran en on_app_command_completion; los errores aquí o,
+    para los híbridos, en on_command_error del bot.
+    """
+
+    async def interaction_check(self, interaction, /):
+        interaction.extras["metrics_start"] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction, error, /):
+        observe_interaction(interaction, ok=False)
+        await super().on_error(interaction, error)
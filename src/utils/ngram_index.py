@@ -0,0 +1,72 @@
+# src/utils/ngram_index.py
+import unicodedata
+from collections import Counter, defaultdict
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text.casefold() if not unicodedata.combining(c))
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+def ngrams(text: str, n: int = 3):
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+class NgramIndex:
+    """Índice de trigramas para buscar títulos por trozos ("frier" -> "Sousou no Frieren").
+
+    Se actualiza fila por fila (add/remove), sin reconstruirse entero.
+    """
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._postings = defaultdict(set)
+        self._docs = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, text: str):
+        self.remove(doc_id)
+        norm = normalize(text)
+        grams = ngrams(norm, self.n)
+        self._docs[doc_id] = (norm, grams)
+        for gram in grams:
+            self._postings[gram].add(doc_id)
+
+    def remove(self, doc_id):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for gram in doc[1]:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int = 25, where=None):
+        """Ids ordenados por parecido; `where(doc_id)` filtra candidatos."""
+        norm = normalize(query)
+        if not norm:
+            ids = sorted(d for d in self._docs if where is None or where(d))
+            return ids[:limit]
+
+        qgrams = ngrams(norm, self.n)
+        shared = Counter()
+        for gram in qgrams:
+            for doc_id in self._postings.get(gram, ()):
+                shared[doc_id] += 1
+
+        scored = []
+        for doc_id, hits in shared.items():
+            if where is not None and not where(doc_id):
+                continue
+            text, grams = self._docs[doc_id]
+            score = hits / len(qgrams | grams)
+            if text.startswith(norm):
+                score += 2
+            elif norm in text:
+                score += 1
+            scored.append((-score, text, doc_id))
+        scored.sort()
+        return [doc_id for _, _, doc_id in scored[:limit]]
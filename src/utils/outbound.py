@@ -0,0 +1,152 @@
+# src/utils/outbound.py
+# Cola central para los mensajes y ediciones que no son respuesta directa a
+# una interacción. Cada canal tiene su propio bucket (token bucket) y una cola
+# por prioridad; las respuestas a interacciones nunca pasan por aquí, así que
+# no esperan detrás de animaciones ni anuncios.
+import heapq
+import asyncio
+import itertools
+
+# Prioridades: menor número sale primero
+HIGH = 0       # Contenido que el usuario está esperando (resultado final, avisos del juego)
+NORMAL = 1
+COSMETIC = 2   # Frames de animación; se descartan si llega uno más nuevo con la misma key
+BROADCAST = 3  # Anuncios agrupados (digest)
+
+CHANNEL_RATE = 5       # mensajes...
+CHANNEL_PER = 5.0      # ...cada tantos segundos por canal
+DIGEST_WINDOW = 3.0
+
+class _Job:
+    __slots__ = ("run", "future", "key", "dropped")
+
+    def __init__(self, run, future, key):
+        self.run = run
+        self.future = future
+        self.key = key
+        self.dropped = False
+
+class _ChannelQueue:
+    __slots__ = ("heap", "keyed", "tokens", "updated", "task")
+
+    def __init__(self, capacity, now):
+        self.heap = []
+        self.keyed = {}
+        self.tokens = capacity
+        self.updated = now
+        self.task = None
+
+class OutboundScheduler:
+    def __init__(self, rate=CHANNEL_RATE, per=CHANNEL_PER, digest_window=DIGEST_WINDOW):
+        self.rate = rate
+        self.per = per
+        self.digest_window = digest_window
+        self._channels = {}
+        self._digests = {}
+        self._digest_tasks = set()  # Referencia fuerte: el loop solo guarda una débil a cada task
+        self._seq = itertools.count()
+        self.dropped = 0
+
+    # --- API ---
+    async def send(self, channel, content=None, *, priority=NORMAL, key=None, wait=True, **kwargs):
+        return await self._submit(channel.id, lambda: channel.send(content, **kwargs), priority, key, wait)
+
+    async def edit(self, message, *, priority=COSMETIC, key=None, wait=True, **kwargs):
+        """Edita `message`. Con `key`, una edición más nueva reemplaza a la pendiente."""
+        return await self._submit(message.channel.id, lambda: message.edit(**kwargs), priority, key, wait)
+
+    def announce(self, channel, item, *, key, render):
+        """Junta los `item` que lleguen en `digest_window` segundos y manda un solo mensaje.
+
+        `render(items)` arma el texto a partir de la lista acumulada.
+        """
+        digest_key = (channel.id, key)
+        pending = self._digests.get(digest_key)
+        if pending is not None:
+            pending.append(item)
+            return
+        self._digests[digest_key] = [item]
+        task = asyncio.create_task(self._flush_digest(channel, digest_key, render))
+        self._digest_tasks.add(task)
+        task.add_done_callback(self._digest_tasks.discard)
+
+    def stats(self):
+        return {
+            "channels": len(self._channels),
+            "queued": sum(len(q.heap) for q in self._channels.values()),
+            "digests": len(self._digests),
+            "dropped": self.dropped,
+        }
+
+    # --- INTERNO ---
+    async def _flush_digest(self, channel, digest_key, render):
+        await asyncio.sleep(self.digest_window)
+        items = self._digests.pop(digest_key, [])
+        if items:
+            await self.send(channel, render(items), priority=BROADCAST, wait=False)
+
+    async def _submit(self, channel_id, run, priority, key, wait):
+        loop = asyncio.get_running_loop()
+        queue = self._channels.get(channel_id)
+        if queue is None:
+            queue = self._channels[channel_id] = _ChannelQueue(self.rate, loop.time())
+
+        job = _Job(run, loop.create_future(), key)
+        if key is not None:
+            stale = queue.keyed.get(key)
+            if stale is not None and not stale.future.done():
+                # El frame viejo ya no sirve: lo descartamos sin gastar rate limit
+                stale.dropped = True
+                stale.future.set_result(None)
+                self.dropped += 1
+            queue.keyed[key] = job
+
+        heapq.heappush(queue.heap, (priority, next(self._seq), job))
+        if queue.task is None:
+            queue.task = asyncio.create_task(self._drain(queue))
+
+        if wait:
+            return await job.future
+        job.future.add_done_callback(_log_failure)
+        return job.future
+
+    async def _drain(self, queue):
+        loop = asyncio.get_running_loop()
+        try:
+            while queue.heap:
+                if queue.heap[0][2].dropped:
+                    heapq.heappop(queue.heap)
+                    continue
+                await self._take_token(queue, loop)
+                _, _, job = heapq.heappop(queue.heap)
+                if job.key is not None and queue.keyed.get(job.key) is job:
+                    del queue.keyed[job.key]
+                if job.dropped:  # Lo reemplazaron mientras esperaba turno
+                    queue.tokens += 1
+                    continue
+                try:
+                    result = await job.run()
+                    if not job.future.done():
+                        job.future.set_result(result)
+                except Exception as e:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+        finally:
+            # La cola (y su bucket) se queda: así una ráfaga justo después no parte con el bucket lleno
+            queue.task = None
+
+    async def _take_token(self, queue, loop):
+        while True:
+            now = loop.time()
+            queue.tokens = min(self.rate, queue.tokens + (now - queue.updated) * self.rate / self.per)
+            queue.updated = now
+            if queue.tokens >= 1:
+                queue.tokens -= 1
+                return
+            await asyncio.sleep((1 - queue.tokens) * self.per / self.rate)
+
+def _log_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"❌ Error en mensaje en cola: {future.exception()}")
+
+outbound = OutboundScheduler()
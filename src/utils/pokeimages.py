@@ -1,10 +1,164 @@
-import requests
+# Descarga las imágenes de pokemons.json a images/ con nombres ya normalizados.
+# Uso: python pokeimages.py [--workers 8] [--base-url http://localhost:8000]
+import os
+import sys
 import json
+import time
+import asyncio
+import hashlib
+import argparse
+from urllib.parse import urlsplit
+import aiohttp
+from image_normalizer import normalize_filename
 
-with open('pokemons.json') as f:
-    data = json.load(f)
+CHUNK_SIZE = 64 * 1024
+RETRIES = 3
+MANIFEST_NAME = "manifest.json"
+# El manifest se guarda cada tantas imágenes: si matan el proceso solo se pierden las últimas
+MANIFEST_SAVE_EVERY = 10
 
-for p in data:
-    img_data = requests.get(p['url']).content
-    with open(f"images/{p['name']}.png", 'wb') as handler:
-        handler.write(img_data)
\ No newline at end of file
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def rebase_url(url, base_url):
+    """Cambia el host de `url` por `base_url` (para probar contra un servidor local)."""
+    if not base_url:
+        return url
+    return base_url.rstrip("/") + urlsplit(url).path
+
+async def fetch_one(session, entry, out_dir, manifest, stats, base_url=None):
+    filename = normalize_filename(f"{entry['name']}.png")
+    path = os.path.join(out_dir, filename)
+    url = rebase_url(entry['url'], base_url)
+    prev = manifest.get(filename) if os.path.exists(path) else None
+
+    # Petición condicional: si no cambió, el servidor responde 304 sin cuerpo
+    headers = {}
+    if prev and prev.get("etag"):
+        headers["If-None-Match"] = prev["etag"]
+    if prev and prev.get("last_modified"):
+        headers["If-Modified-Since"] = prev["last_modified"]
+
+    for attempt in range(1, RETRIES + 1):
+        try:
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    stats["not_modified"] += 1
+                    return
+
+                resp.raise_for_status()
+                hasher = hashlib.sha256()
+                size = 0
+                tmp = path + ".part"
+                try:
+                    with open(tmp, "wb") as f:
+                        async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            size += len(chunk)
+
+                    digest = hasher.hexdigest()
+                    if prev and prev.get("sha256") == digest:
+                        stats["unchanged"] += 1
+                    else:
+                        os.replace(tmp, path)
+                        stats["downloaded"] += 1
+                        print(f"✅ {filename} ({size / 1024:.1f} KB)")
+                finally:
+                    # Descarga cortada o igual a la anterior: no queda un .part huérfano
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+
+                stats["bytes"] += size
+                manifest[filename] = {
+                    "name": entry['name'],
+                    "url": entry['url'],
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "sha256": digest,
+                    "size": size,
+                }
+                return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Un 404 no se arregla reintentando; un 429 o un 5xx sí puede
+            permanent = isinstance(e, aiohttp.ClientResponseError) and e.status < 500 and e.status != 429
+            if permanent or attempt == RETRIES:
+                stats["failed"] += 1
+                print(f"❌ {filename}: {e}")
+                return
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def run(entries, out_dir="images", workers=8, base_url=None, timeout=30, save_every=MANIFEST_SAVE_EVERY):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    stats = {"downloaded": 0, "unchanged": 0, "not_modified": 0, "failed": 0, "bytes": 0}
+
+    queue = asyncio.Queue()
+    for entry in entries:
+        queue.put_nowait(entry)
+
+    unsaved = 0
+
+    async def worker(session):
+        nonlocal unsaved
+        while True:
+            try:
+                entry = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await fetch_one(session, entry, out_dir, manifest, stats, base_url)
+            unsaved += 1
+            if unsaved >= save_every:
+                # Escritura atómica (tmp + replace) y sin await de por medio: los workers no se pisan
+                save_manifest(out_dir, manifest)
+                unsaved = 0
+
+    start = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=workers)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            await asyncio.gather(*(worker(session) for _ in range(workers)))
+    finally:
+        # Si se corta con una excepción, lo ya descargado queda en el manifest para la próxima
+        save_manifest(out_dir, manifest)
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = elapsed
+    print(
+        f"\n{len(entries)} imágenes en {elapsed:.2f}s "
+        f"({len(entries) / elapsed:.1f} img/s, {stats['bytes'] / 1024 / 1024 / elapsed:.2f} MB/s) | "
+        f"nuevas: {stats['downloaded']}, iguales: {stats['unchanged']}, "
+        f"304: {stats['not_modified']}, fallidas: {stats['failed']}"
+    )
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Descarga las imágenes del roster de Unite.")
+    parser.add_argument("--source", default="pokemons.json")
+    parser.add_argument("--out", default="images")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--base-url", help="Servidor alternativo (p. ej. uno local con imágenes de prueba)")
+    parser.add_argument("--save-every", type=int, default=MANIFEST_SAVE_EVERY,
+                        help="Guarda el manifest cada N imágenes (para retomar si se corta)")
+    args = parser.parse_args(argv)
+
+    with open(args.source, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    stats = asyncio.run(run(entries, args.out, args.workers, args.base_url, save_every=args.save_every))
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
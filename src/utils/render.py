@@ -0,0 +1,147 @@
+# src/utils/render.py
+# Capa de render compartida para las vistas interactivas (Flip 7, watchlist):
+# memoiza el embed por versión de estado, no reenvía ediciones idénticas y
+# agrupa ráfagas de clicks en una sola edición.
+import json
+import time
+import asyncio
+import hashlib
+import discord
+from utils import repository
+from utils.metrics import metrics, item_name
+
+COALESCE_WINDOW = 0.35
+
+async def reply_unavailable(interaction):
+    """Avisa (efímero) que Supabase está caído en vez de dejar la interacción sin respuesta."""
+    try:
+        if interaction.response.is_done():
+            await interaction.followup.send(repository.UNAVAILABLE_MESSAGE, ephemeral=True)
+        else:
+            await interaction.response.send_message(repository.UNAVAILABLE_MESSAGE, ephemeral=True)
+    except discord.HTTPException:
+        pass
+
+class TimedView(discord.ui.View):
+    """View que mide la duración de cada callback (utils/metrics.py).
+
+    Envuelve `item.callback` de cada hijo (API pública de discord.ui.Item), así
+    que no depende de cómo discord.py despacha las interacciones por dentro.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for item in self.children:
+            self._time_callback(item)
+
+    def add_item(self, item):
+        self._time_callback(item)
+        return super().add_item(item)
+
+    def _time_callback(self, item):
+        callback = item.callback
+        if getattr(callback, "_timed", False):
+            return
+        view, name = type(self).__name__, item_name(item)
+
+        async def timed(interaction):
+            start = time.perf_counter()
+            ok = False
+            try:
+                await callback(interaction)
+                ok = True
+            finally:
+                metrics.observe_view(view, name, time.perf_counter() - start, ok)
+
+        timed._timed = True
+        item.callback = timed
+
+    async def on_error(self, interaction, error, item):
+        if repository.is_unavailable(error):
+            await reply_unavailable(interaction)
+            return
+        await super().on_error(interaction, error, item)
+
+class RenderedView(TimedView):
+    """Base para vistas que se redibujan con cada click.
+
+    Las subclases implementan `render_key()` (algo hashable que cambia cuando
+    cambia lo visible) y `create_embed()`. Los callbacks llaman a `refresh()`
+    en vez de `interaction.response.edit_message(...)`.
+    """
+
+    coalesce_window = COALESCE_WINDOW
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._embed_cache = None  # (render_key, embed, huella)
+        self._last_sent = None
+        self._window_until = 0.0
+        self._flush = None
+        self._flush_interaction = None
+
+    def render_key(self):
+        raise NotImplementedError
+
+    def render(self):
+        """Embed actual para enviar el mensaje inicial; queda como lo último enviado."""
+        embed, fingerprint = self._rendered()
+        self._last_sent = fingerprint
+        return embed
+
+    def _rendered(self):
+        key = (self.render_key(), self._components_key())
+        if self._embed_cache is None or self._embed_cache[0] != key:
+            embed = self.create_embed()
+            payload = json.dumps(embed.to_dict(), sort_keys=True, default=str) + repr(key[1])
+            fingerprint = hashlib.blake2b(payload.encode(), digest_size=16).digest()
+            self._embed_cache = (key, embed, fingerprint)
+        return self._embed_cache[1], self._embed_cache[2]
+
+    def _components_key(self):
+        return tuple((getattr(i, "custom_id", None), getattr(i, "disabled", None)) for i in self.children)
+
+    async def refresh(self, interaction: discord.Interaction):
+        """Responde al click con el estado actual de la vista."""
+        embed, fingerprint = self._rendered()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        if fingerprint == self._last_sent and self._flush is None:
+            # Nada visible cambió (p. ej. "Siguiente" en la última página): solo confirmamos
+            await interaction.response.defer()
+            return
+
+        if now < self._window_until:
+            # Ráfaga: confirmamos el click y editamos una sola vez al cerrar la ventana
+            await interaction.response.defer()
+            self._flush_interaction = interaction
+            if self._flush is None:
+                self._flush = asyncio.create_task(self._flush_later(self._window_until - now))
+            return
+
+        await interaction.response.edit_message(embed=embed, view=self)
+        self._last_sent = fingerprint
+        self._window_until = now + self.coalesce_window
+
+    async def _flush_later(self, delay):
+        await asyncio.sleep(delay)
+        interaction = self._flush_interaction
+        self._flush = None
+        self._flush_interaction = None
+        embed, fingerprint = self._rendered()
+        if fingerprint == self._last_sent:
+            return
+        try:
+            await interaction.edit_original_response(embed=embed, view=self)
+            self._last_sent = fingerprint
+        except discord.HTTPException as e:
+            print(f"❌ Error al redibujar la vista: {e}")
+        self._window_until = asyncio.get_running_loop().time() + self.coalesce_window
+
+    def cancel_render(self):
+        """Descarta una edición agrupada pendiente (antes de reemplazar el mensaje)."""
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+            self._flush_interaction = None
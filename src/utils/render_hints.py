@@ -0,0 +1,67 @@
+# Genera las pistas visuales de Unitedle a partir de images/ y las empaqueta en un solo archivo.
+# Requiere Pillow (solo este script, el bot no lo necesita).
+# Uso: python render_hints.py [--images images] [--out ../../assets/hints.pack] [--workers N]
+import io
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from hint_pack import write_pack
+
+SIZE = 256
+
+def pixelate(img, blocks):
+    small = img.resize((blocks, blocks), Image.Resampling.NEAREST)
+    return small.resize(img.size, Image.Resampling.NEAREST)
+
+def silhouette(img):
+    alpha = img.getchannel("A")
+    out = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    out.paste((20, 20, 20, 255), mask=alpha.point(lambda a: 255 if a > 40 else 0))
+    return out
+
+def to_png(img):
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+def render(path):
+    """Los 3 niveles de pista: 1 = silueta pixelada, 2 = silueta, 3 = colores pixelados."""
+    with Image.open(path) as source:
+        img = source.convert("RGBA")
+    img.thumbnail((SIZE, SIZE))
+    canvas = Image.new("RGBA", (SIZE, SIZE), (0, 0, 0, 0))
+    canvas.paste(img, ((SIZE - img.width) // 2, (SIZE - img.height) // 2))
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name, {
+        1: to_png(pixelate(silhouette(canvas), 12)),
+        2: to_png(silhouette(canvas)),
+        3: to_png(pixelate(canvas, 24)),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza y empaqueta las pistas de Unitedle.")
+    parser.add_argument("--images", default="images")
+    parser.add_argument("--out", default=os.path.join("..", "..", "assets", "hints.pack"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        os.path.join(args.images, f) for f in os.listdir(args.images) if f.endswith(".png")
+    )
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        entries = dict(pool.map(render, paths, chunksize=4))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    write_pack(args.out, entries)
+    size = os.path.getsize(args.out)
+    print(f"✅ {len(entries)} Pokémon renderizados en {time.perf_counter() - start:.2f}s -> "
+          f"{args.out} ({size / 1024:.0f} KB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+# src/utils/repository.py
+# Capa de acceso a datos asíncrona sobre el cliente de utils/database.py
+# (que se crea recién en la primera consulta).
+# El cliente de Supabase es síncrono: cada .execute() corre en un pool de
+# hilos acotado para no congelar el event loop de discord.py. Las lecturas
+# se reintentan con backoff y un circuit breaker corta todo mientras
+# Supabase no responde.
+import os
+import time
+import random
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from utils.database import get_client
+from utils.metrics import metrics, query_labels
+from utils.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+DB_MAX_CONCURRENCY = int(os.getenv("DB_MAX_CONCURRENCY", "8"))
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "10"))
+DB_READ_RETRIES = int(os.getenv("DB_READ_RETRIES", "2"))
+DB_RETRY_BASE = 0.2
+DB_RETRY_CAP = 2.0
+DB_BREAKER_FAILURES = int(os.getenv("DB_BREAKER_FAILURES", "5"))
+DB_BREAKER_RESET = float(os.getenv("DB_BREAKER_RESET", "30"))
+DB_HEALTH_TIMEOUT = float(os.getenv("DB_HEALTH_TIMEOUT", "3"))
+# Filas por página en las lecturas grandes; no puede pasar de max-rows de PostgREST
+WATCHLIST_PAGE_SIZE = 1000
+
+# Solo estos se reintentan: repetirlos no cambia nada en la DB
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+UNAVAILABLE_MESSAGE = "🔌 La base de datos no está respondiendo. Inténtalo de nuevo en un rato."
+
+class DatabaseUnavailable(Exception):
+    """Supabase está caído (circuito abierto): la llamada ni siquiera se intentó."""
+
+    def __init__(self, retry_after=0.0):
+        super().__init__(f"Supabase no disponible (reintento en {retry_after:.0f} s)")
+        self.retry_after = retry_after
+
+def is_unavailable(error):
+    """True si `error` (o lo que envuelve, p. ej. CommandInvokeError) es DatabaseUnavailable."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, DatabaseUnavailable):
+            return True
+        seen.add(id(error))
+        error = getattr(error, "original", None) or error.__cause__
+    return False
+
+def _is_transient(error):
+    # Timeouts y errores de red; un error de la API (constraint, permisos) significa que Supabase respondió
+    import httpx
+    return isinstance(error, (asyncio.TimeoutError, httpx.TransportError, ConnectionError))
+
+def _on_breaker_change(previous, state):
+    metrics.db_breaker_state.set({CLOSED: 0, HALF_OPEN: 1, OPEN: 2}[state])
+    if state == OPEN:
+        print(f"🔌 Supabase no responde: circuito abierto por {DB_BREAKER_RESET:.0f} s.")
+    elif state == CLOSED:
+        print("✅ Supabase respondió de nuevo: circuito cerrado.")
+
+breaker = CircuitBreaker(DB_BREAKER_FAILURES, DB_BREAKER_RESET, on_change=_on_breaker_change)
+metrics.db_breaker_state.set(0)
+
+_executor = ThreadPoolExecutor(max_workers=DB_MAX_CONCURRENCY, thread_name_prefix="supabase")
+_semaphore = asyncio.Semaphore(DB_MAX_CONCURRENCY)
+
+
+def _release_slot(future):
+    _semaphore.release()
+    # Si quien esperaba ya se fue por timeout, el error no lo lee nadie más
+    if not future.cancelled():
+        future.exception()
+
+async def _run_in_slot(query, timeout):
+    """Corre query.execute en el pool con `timeout` para todo (cupo + consulta).
+
+    El cupo del semáforo se libera cuando el hilo termina y no cuando se deja
+    de esperar: si no, tras un timeout entrarían más consultas que hilos.
+    """
+    deadline = time.monotonic() + timeout
+    # Si el timeout llega esperando cupo, la consulta nunca sale (importa en las escrituras)
+    await asyncio.wait_for(_semaphore.acquire(), timeout)
+    try:
+        future = asyncio.get_running_loop().run_in_executor(_executor, query.execute)
+    except BaseException:
+        _semaphore.release()
+        raise
+    future.add_done_callback(_release_slot)
+    return await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+
+async def execute(query, timeout: float = DB_TIMEOUT, retries: int = None, probe: bool = False):
+    """Ejecuta un query builder de Supabase fuera del event loop.
+
+    Las lecturas (GET) se reintentan `retries` veces (DB_READ_RETRIES por
+    defecto) con backoff exponencial y jitter, solo ante timeouts o errores
+    de red. Con el circuito abierto lanza DatabaseUnavailable sin tocar la
+    red; `probe=True` (el health check) pasa igual y es quien lo reabre.
+    """
+    table, method = query_labels(query)
+    if retries is None:
+        retries = DB_READ_RETRIES if method in IDEMPOTENT_METHODS else 0
+
+    attempt = 0
+    while True:
+        if not probe and not breaker.allow():
+            metrics.db_rejected.inc(table)
+            raise DatabaseUnavailable(breaker.retry_after())
+
+        start = time.perf_counter()
+        try:
+            response = await _run_in_slot(query, timeout)
+        except Exception as e:
+            metrics.observe_db(table, method, time.perf_counter() - start, e)
+            if not _is_transient(e):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if attempt >= retries:
+                raise
+            attempt += 1
+            metrics.db_retries.inc(table)
+            # Full jitter: cada reintento espera un tiempo al azar hasta el tope exponencial
+            await asyncio.sleep(random.uniform(0, min(DB_RETRY_CAP, DB_RETRY_BASE * 2 ** attempt)))
+            continue
+
+        # Incluye la espera por el semáforo: es lo que siente quien llama
+        metrics.observe_db(table, method, time.perf_counter() - start)
+        breaker.record_success()
+        return response
+
+async def health_check():
+    """Sondeo liviano (una fila) que siempre sale, aunque el circuito esté abierto.
+
+    Su resultado alimenta el breaker y la métrica pascualkyu_db_up.
+    """
+    try:
+        await execute(get_client().table("watchlist").select("id").limit(1),
+                      timeout=DB_HEALTH_TIMEOUT, retries=0, probe=True)
+        ok = True
+    except Exception as e:
+        ok = not _is_transient(e)
+    metrics.db_up.set(1 if ok else 0)
+    return ok
+
+
+# --- WATCHLIST ---
+async def get_watchlist_changes(since: str = None):
+    """Filas del watchlist con updated_at >= `since` (todas si es None).
+
+    PostgREST corta cada respuesta en max-rows (1000 en Supabase), así que se
+    pide por páginas con keyset sobre el id hasta que llega una página corta.
+    """
+    rows = []
+    last_id = None
+    while True:
+        query = get_client().table("watchlist").select("*")
+        if since:
+            query = query.gte("updated_at", since)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        response = await execute(query.order("id").limit(WATCHLIST_PAGE_SIZE))
+        rows.extend(response.data)
+        if len(response.data) < WATCHLIST_PAGE_SIZE:
+            return rows
+        last_id = response.data[-1]['id']
+
+async def add_anime(title: str, added_by: str):
+    data = {"title": title, "added_by": added_by, "status": False}
+    response = await execute(get_client().table("watchlist").insert(data))
+    return response.data
+
+async def add_animes(rows: list):
+    response = await execute(get_client().table("watchlist").insert(rows))
+    return response.data
+
+async def mark_watched(row_id: int):
+    response = await execute(get_client().table("watchlist").update({"status": True}).eq("id", row_id))
+    return response.data
+
+async def delete_anime(row_id: int):
+    response = await execute(get_client().table("watchlist").delete().eq("id", row_id))
+    return response.data
+
+
+# --- UNITEDLE ---
+async def get_daily_pokemon(date: str):
+    response = await execute(
+        get_client().table("daily_pokemon").select("*, pokemon_unite(*)").eq("date", date).maybe_single()
+    )
+    # maybe_single() devuelve None (no un error) cuando aún no hay fila para ese día
+    return response.data if response else None
+
+async def get_user_attempts(user_id: int, date: str):
+    response = await execute(
+        get_client().table("user_attempts").select("*").eq("user_id", user_id).eq("date", date)
+    )
+    return response.data
+
+async def get_winning_attempt(user_id: int, date: str, target_name: str):
+    response = await execute(
+        get_client().table("user_attempts").select("*")
+        .eq("user_id", user_id)
+        .eq("date", date)
+        .eq("guess", target_name)
+    )
+    return response.data
+
+async def submit_guess(user_id: int, date: str, guess: str, target: str, feedback: str):
+    """Registra el intento en una sola llamada (ver supabase/migrations/*_submit_unitedle_guess.sql).
+
+    Devuelve {"attempt_number", "won", "already_won", "hint_level", "stats"}, con
+    `stats` la fila actualizada de unitedle_stats (None si ya había ganado).
+    """
+    response = await execute(get_client().rpc("submit_unitedle_guess", {
+        "p_user_id": user_id,
+        "p_date": date,
+        "p_guess": guess,
+        "p_target": target,
+        "p_feedback": feedback
+    }))
+    return response.data[0]
+
+async def get_all_stats():
+    response = await execute(get_client().table("unitedle_stats").select("*"))
+    return response.data
+
+async def get_pokemon_ids():
+    response = await execute(get_client().table("pokemon_unite").select("id"))
+    return [row['id'] for row in response.data]
+
+async def get_daily_history(since: str):
+    response = await execute(get_client().table("daily_pokemon").select("date, pokemon_id").gte("date", since))
+    return {row['date']: row['pokemon_id'] for row in response.data}
+
+async def insert_daily_selections(rows: list):
+    # ON CONFLICT (date) DO NOTHING: si otra instancia ya llenó ese día, se respeta
+    response = await execute(
+        get_client().table("daily_pokemon").upsert(rows, on_conflict="date", ignore_duplicates=True)
+    )
+    return response.data
@@ -0,0 +1,72 @@
+# src/utils/roster.py
+import os
+import json
+import bisect
+import difflib
+import unicodedata
+
+ROSTER_PATH = os.path.join(os.path.dirname(__file__), "pokemons.json")
+
+def normalize(text: str) -> str:
+    """'Mr. Mime', 'mr mime' y 'MR-MIME' quedan todos como 'mrmime'."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text.lower() if c.isalnum())
+
+class RosterIndex:
+    """Índice en memoria del roster de Unite para validar y autocompletar guesses."""
+
+    def __init__(self, names):
+        self.names = sorted(set(names))
+        self._by_key = {normalize(n): n for n in self.names}
+        self._keys = sorted(self._by_key)
+
+        # Un prefijo por cada palabra del nombre, así "charizard" encuentra "Mega Charizard X"
+        self._prefixes = []
+        for name in self.names:
+            words = unicodedata.normalize("NFKD", name).lower().split()
+            for i in range(len(words)):
+                self._prefixes.append((normalize(" ".join(words[i:])), name))
+        self._prefixes.sort()
+
+    @classmethod
+    def from_json(cls, path=ROSTER_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(p["name"] for p in json.load(f))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize(name) in self._by_key
+
+    def resolve(self, text: str, cutoff: float = 0.85):
+        """Devuelve el nombre canónico de `text`, o None si no se parece a ningún Pokémon."""
+        key = normalize(text)
+        if not key:
+            return None
+        if key in self._by_key:
+            return self._by_key[key]
+        close = difflib.get_close_matches(key, self._keys, n=1, cutoff=cutoff)
+        return self._by_key[close[0]] if close else None
+
+    def search(self, text: str, limit: int = 25):
+        """Sugerencias por prefijo y, si faltan, por parecido. Todo en memoria."""
+        key = normalize(text)
+        if not key:
+            return self.names[:limit]
+
+        results = []
+        i = bisect.bisect_left(self._prefixes, (key, ""))
+        while i < len(self._prefixes) and self._prefixes[i][0].startswith(key):
+            name = self._prefixes[i][1]
+            if name not in results:
+                results.append(name)
+            i += 1
+        results.sort(key=lambda n: (not normalize(n).startswith(key), n))
+
+        if len(results) < limit:
+            for close in difflib.get_close_matches(key, self._keys, n=limit, cutoff=0.6):
+                name = self._by_key[close]
+                if name not in results:
+                    results.append(name)
+        return results[:limit]
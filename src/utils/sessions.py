@@ -0,0 +1,183 @@
+# src/utils/sessions.py
+# Registro central de las partidas/lobbies interactivos (Flip 7): límites por
+# servidor y por usuario, expulsión por inactividad/LRU y snapshot al apagar.
+import os
+import sys
+import json
+import time
+from collections import OrderedDict
+
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "200"))
+MAX_SESSIONS_PER_GUILD = int(os.getenv("MAX_SESSIONS_PER_GUILD", "5"))
+MAX_SESSIONS_PER_USER = int(os.getenv("MAX_SESSIONS_PER_USER", "1"))
+SESSIONS_SNAPSHOT_PATH = os.getenv("SESSIONS_SNAPSHOT_PATH", "sessions.json")
+
+def deep_sizeof(obj, seen=None):
+    """Tamaño aproximado en bytes de `obj` y todo lo que contiene.
+
+    No entra en objetos de discord.py: por sus __slots__ un Member lleva a su
+    Guild y de ahí a toda la caché del gateway.
+    """
+    seen = seen if seen is not None else set()
+    if id(obj) in seen or type(obj).__module__.startswith("discord"):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(i, seen) for i in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    return size
+
+class Session:
+    __slots__ = ("key", "kind", "guild_id", "owner_id", "view", "message", "idle_timeout", "last_active")
+
+    def __init__(self, key, kind, guild_id, owner_id, view, message, idle_timeout):
+        self.key = key
+        self.kind = kind
+        self.guild_id = guild_id
+        self.owner_id = owner_id
+        self.view = view
+        self.message = message
+        self.idle_timeout = idle_timeout
+        self.last_active = time.monotonic()
+
+class SessionRegistry:
+    """Sesiones vivas por (channel_id, message_id), en orden LRU."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, max_per_guild=MAX_SESSIONS_PER_GUILD,
+                 max_per_user=MAX_SESSIONS_PER_USER):
+        self.max_sessions = max_sessions
+        self.max_per_guild = max_per_guild
+        self.max_per_user = max_per_user
+        self._sessions = OrderedDict()
+        self._restorers = {}  # kind -> coroutine(bot, snapshot) -> (view, message)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def can_open(self, guild_id, user_id):
+        """(True, None) o (False, motivo) antes de abrir un lobby nuevo."""
+        in_guild = sum(1 for s in self._sessions.values() if s.guild_id == guild_id)
+        if guild_id is not None and in_guild >= self.max_per_guild:
+            return False, f"Ya hay {in_guild} partidas activas en este servidor."
+        by_user = sum(1 for s in self._sessions.values() if s.owner_id == user_id)
+        if by_user >= self.max_per_user:
+            return False, "Ya tienes una partida abierta, termínala primero."
+        return True, None
+
+    async def register(self, message, view, kind, owner_id, idle_timeout):
+        key = (message.channel.id, message.id)
+        guild = getattr(message, "guild", None)
+        self._sessions.pop(key, None)  # El juego reemplaza al lobby en el mismo mensaje
+        self._sessions[key] = Session(key, kind, guild.id if guild else None, owner_id, view, message, idle_timeout)
+        view.session_key = key
+
+        while len(self._sessions) > self.max_sessions:
+            oldest = next(iter(self._sessions))
+            await self.evict(oldest, "Partida cerrada para hacer espacio a otras.")
+        return key
+
+    def touch(self, key):
+        session = self._sessions.get(key)
+        if session is not None:
+            session.last_active = time.monotonic()
+            self._sessions.move_to_end(key)
+
+    def remove(self, key):
+        return self._sessions.pop(key, None)
+
+    async def evict(self, key, reason=None):
+        """Cierra la sesión: detiene la vista y deshabilita sus botones en Discord."""
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return
+        view = session.view
+        view.stop()
+        for item in view.children:
+            item.disabled = True
+        try:
+            if reason:
+                await session.message.edit(content=f"⌛ {reason}", view=view)
+            else:
+                await session.message.edit(view=view)
+        except Exception as e:
+            print(f"❌ No pude cerrar la sesión {key}: {e}")
+
+    async def evict_idle(self):
+        now = time.monotonic()
+        idle = [k for k, s in self._sessions.items() if now - s.last_active > s.idle_timeout]
+        for key in idle:
+            await self.evict(key, "Partida cerrada por inactividad.")
+        return len(idle)
+
+    def stats(self):
+        by_kind = {}
+        for s in self._sessions.values():
+            by_kind[s.kind] = by_kind.get(s.kind, 0) + 1
+        # Solo el estado de la partida: el mensaje y la vista son de discord.py y se comparten con su caché
+        memory = sum(sys.getsizeof(s) + deep_sizeof(s.key) + deep_sizeof(getattr(s.view, "game", None))
+                     for s in self._sessions.values())
+        return {
+            "total": len(self._sessions),
+            "by_kind": by_kind,
+            "guilds": len({s.guild_id for s in self._sessions.values()}),
+            "approx_bytes": memory,
+        }
+
+    # --- SNAPSHOTS ---
+    def register_restorer(self, kind, restorer):
+        self._restorers[kind] = restorer
+
+    def save_snapshot(self, path=SESSIONS_SNAPSHOT_PATH):
+        """Guarda las sesiones que saben serializarse (view.snapshot()) para el próximo arranque."""
+        data = []
+        for s in self._sessions.values():
+            snapshot = getattr(s.view, "snapshot", None)
+            if snapshot is None:
+                continue
+            data.append({
+                "kind": s.kind,
+                "channel_id": s.key[0],
+                "message_id": s.key[1],
+                "guild_id": s.guild_id,
+                "owner_id": s.owner_id,
+                "idle_timeout": s.idle_timeout,
+                "state": snapshot(),
+            })
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        return len(data)
+
+    async def restore_snapshot(self, bot, path=SESSIONS_SNAPSHOT_PATH):
+        if not os.path.exists(path):
+            return 0
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        os.remove(path)
+
+        restored = 0
+        for entry in data:
+            restorer = self._restorers.get(entry["kind"])
+            channel = bot.get_channel(entry["channel_id"])
+            if restorer is None or channel is None:
+                continue
+            try:
+                message = channel.get_partial_message(entry["message_id"])
+                view = await restorer(bot, entry["state"])
+                bot.add_view(view, message_id=entry["message_id"])
+                key = (entry["channel_id"], entry["message_id"])
+                self._sessions[key] = Session(
+                    key, entry["kind"], entry["guild_id"], entry["owner_id"], view, message, entry["idle_timeout"]
+                )
+                view.session_key = key
+                restored += 1
+            except Exception as e:
+                print(f"❌ No pude restaurar la sesión {entry['message_id']}: {e}")
+        return restored
+
+sessions = SessionRegistry()
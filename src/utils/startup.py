@@ -0,0 +1,70 @@
+# src/utils/startup.py
+# Medición del arranque por fases y sincronización del árbol de comandos
+# solo cuando cambió (cada deploy reinicia el contenedor).
+import os
+import json
+import time
+import hashlib
+from contextlib import contextmanager
+
+COMMAND_TREE_HASH_PATH = os.getenv("COMMAND_TREE_HASH_PATH", os.path.join(".cache", "command_tree.sha256"))
+
+class PhaseTimer:
+    """Acumula la duración de cada fase del arranque para imprimirla al final."""
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = []  # [(nombre, segundos)]
+
+    def mark(self, name, since):
+        self.phases.append((name, time.perf_counter() - since))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, start)
+
+    def report(self):
+        total = time.perf_counter() - self.started
+        lines = [f"⏱️ Arranque en {total * 1000:.0f} ms:"]
+        for name, elapsed in self.phases:
+            lines.append(f"   {name:<22} {elapsed * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+def command_tree_hash(tree, application_id):
+    """Huella del árbol tal como se manda a Discord (incluye la app, por si cambia el token)."""
+    payload = sorted((cmd.to_dict(tree) for cmd in tree.get_commands()), key=lambda c: c["name"])
+    data = json.dumps({"app": application_id, "commands": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def read_tree_hash(path=COMMAND_TREE_HASH_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def write_tree_hash(digest, path=COMMAND_TREE_HASH_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(digest)
+    os.replace(tmp, path)
+
+async def sync_if_changed(tree, application_id, force=False, path=COMMAND_TREE_HASH_PATH):
+    """Sincroniza los slash commands solo si el árbol cambió desde el último sync.
+
+    Devuelve la lista sincronizada, o None si se saltó.
+    """
+    digest = command_tree_hash(tree, application_id)
+    if not force and read_tree_hash(path) == digest:
+        return None
+    synced = await tree.sync()
+    try:
+        write_tree_hash(digest, path)
+    except OSError as e:
+        print(f"❌ No pude guardar el hash de comandos: {e}")
+    return synced
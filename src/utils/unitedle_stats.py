@@ -0,0 +1,86 @@
+# src/utils/unitedle_stats.py
+import bisect
+from datetime import date as Date, timedelta
+
+class UserStats:
+    __slots__ = ("user_id", "played", "wins", "current_streak", "best_streak",
+                 "last_played_date", "last_win_date", "histogram")
+
+    def __init__(self, user_id, played=0, wins=0, current_streak=0, best_streak=0,
+                 last_played_date=None, last_win_date=None, histogram=None):
+        self.user_id = int(user_id)
+        self.played = played
+        self.wins = wins
+        self.current_streak = current_streak
+        self.best_streak = best_streak
+        self.last_played_date = last_played_date
+        self.last_win_date = last_win_date
+        # {"intentos": victorias}; las llaves son strings porque se guarda como jsonb
+        self.histogram = dict(histogram or {})
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**{k: row.get(k) for k in cls.__slots__ if row.get(k) is not None})
+
+    def to_row(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @property
+    def win_rate(self):
+        return self.wins / self.played if self.played else 0.0
+
+    @property
+    def average_attempts(self):
+        if not self.wins:
+            return 0.0
+        return sum(int(k) * v for k, v in self.histogram.items()) / self.wins
+
+    def streak_on(self, today: str):
+        """La racha actual sigue viva solo si ganó hoy o ayer."""
+        if not self.last_win_date:
+            return 0
+        yesterday = (Date.fromisoformat(today) - timedelta(days=1)).isoformat()
+        return self.current_streak if self.last_win_date >= yesterday else 0
+
+    def ranking_key(self):
+        return (-self.wins, -self.best_streak, self.user_id)
+
+class StatsStore:
+    """Agregados de Unitedle en memoria, espejo de la tabla unitedle_stats.
+
+    La DB los actualiza en la misma llamada que registra cada intento y devuelve
+    la fila nueva, que se aplica con `apply`. `get` es O(1) y `leaderboard(k)`
+    devuelve los k primeros de un ranking que se mantiene ordenado al escribir.
+    """
+
+    def __init__(self, load_all):
+        self._load_all = load_all  # coroutine: () -> [filas]
+        self._stats = {}
+        self._ranking = []
+
+    async def load(self):
+        rows = await self._load_all()
+        self._stats = {int(r['user_id']): UserStats.from_row(r) for r in rows}
+        self._ranking = sorted(s.ranking_key() for s in self._stats.values())
+
+    def get(self, user_id):
+        return self._stats.get(int(user_id))
+
+    def leaderboard(self, k=10):
+        return [self._stats[key[2]] for key in self._ranking[:k]]
+
+    def apply(self, row):
+        """Reemplaza los agregados de un usuario por la fila que devolvió submit_unitedle_guess."""
+        stats = UserStats.from_row(row)
+        previous = self._stats.get(stats.user_id)
+        if previous is not None:
+            self._unrank(previous)
+        self._stats[stats.user_id] = stats
+        bisect.insort(self._ranking, stats.ranking_key())
+        return stats
+
+    def _unrank(self, stats):
+        key = stats.ranking_key()
+        i = bisect.bisect_left(self._ranking, key)
+        if i < len(self._ranking) and self._ranking[i] == key:
+            del self._ranking[i]
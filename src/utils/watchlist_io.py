@@ -0,0 +1,90 @@
+# src/utils/watchlist_io.py
+# Importar/exportar el watchlist: CSV, JSON y el export XML de MyAnimeList.
+import io
+import csv
+import gzip
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+from utils.ngram_index import normalize
+
+TITLE_COLUMNS = ("title", "titulo", "name", "series_title", "anime")
+# Estados de MyAnimeList que cuentan como "visto"
+MAL_WATCHED = {"completed"}
+
+def title_key(title: str) -> bytes:
+    """Llave compacta para deduplicar: 'Frieren', 'FRIEREN ' y 'Frieren!' son la misma."""
+    return hashlib.blake2b(normalize(title).encode(), digest_size=8).digest()
+
+def parse_import(filename: str, data: bytes):
+    """Devuelve [(título, visto), ...] a partir de un archivo CSV, JSON o XML de MAL."""
+    name = filename.lower()
+    if name.endswith(".gz"):
+        data = gzip.decompress(data)
+        name = name[:-3]
+
+    if name.endswith(".json"):
+        entries = _parse_json(data)
+    elif name.endswith(".xml"):
+        entries = _parse_mal_xml(data)
+    else:
+        entries = _parse_csv(data)
+    return [(t.strip(), watched) for t, watched in entries if t and t.strip()]
+
+def _parse_csv(data: bytes):
+    text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    lowered = [h.strip().lower() for h in header]
+    column = next((lowered.index(c) for c in TITLE_COLUMNS if c in lowered), None)
+    status_col = next((lowered.index(c) for c in ("status", "estado", "my_status") if c in lowered), None)
+    if column is None:
+        # Sin encabezado reconocible: la primera columna es el título
+        column = 0
+        yield header[0], False
+
+    for row in reader:
+        if len(row) > column:
+            watched = status_col is not None and len(row) > status_col and _is_watched(row[status_col])
+            yield row[column], watched
+
+def _parse_json(data: bytes):
+    items = json.loads(data)
+    if isinstance(items, dict):
+        items = items.get("data") or items.get("watchlist") or []
+    for item in items:
+        if isinstance(item, str):
+            yield item, False
+        elif isinstance(item, dict):
+            # MAL API: {"node": {"title": ...}, "list_status": {"status": ...}}
+            node = item.get("node", item)
+            title = next((node.get(c) for c in TITLE_COLUMNS if node.get(c)), None)
+            status = item.get("list_status", {}).get("status", item.get("status"))
+            if title:
+                yield title, _is_watched(status)
+
+def _parse_mal_xml(data: bytes):
+    for _, elem in ET.iterparse(io.BytesIO(data)):
+        if elem.tag == "anime":
+            yield elem.findtext("series_title") or "", _is_watched(elem.findtext("my_status"))
+            elem.clear()
+
+def _is_watched(status) -> bool:
+    if isinstance(status, bool):
+        return status
+    return str(status or "").strip().lower() in MAL_WATCHED | {"true", "1", "visto", "watched"}
+
+def export_rows(rows, fmt: str = "csv") -> bytes:
+    fields = ("title", "status", "added_by")
+    if fmt == "json":
+        return json.dumps([{k: r.get(k) for k in fields} for r in rows], ensure_ascii=False, indent=2).encode()
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    for r in rows:
+        writer.writerow([r.get(k) for k in fields])
+    return out.getvalue().encode("utf-8-sig")
@@ -0,0 +1,237 @@
+# src/utils/watchlist_store.py
+# Réplica local del watchlist: las lecturas salen de memoria y las escrituras
+# pasan por la DB (write-through) y se aplican a la copia con lo que devuelve.
+import os
+import json
+import asyncio
+import bisect
+import sqlite3
+from datetime import datetime
+from utils import repository
+from utils.ngram_index import NgramIndex
+from utils.watchlist_io import title_key
+
+WATCHLIST_SQLITE_PATH = os.getenv("WATCHLIST_SQLITE_PATH")
+# Cada cuántos refresh incrementales se hace uno completo (para ver borrados remotos)
+FULL_SYNC_EVERY = int(os.getenv("WATCHLIST_FULL_SYNC_EVERY", "12"))
+# Filas por insert en las importaciones masivas
+IMPORT_CHUNK_SIZE = 500
+# Valor del autocompletado: "id:86" no se confunde con un anime que se llame "86"
+ID_PREFIX = "id:"
+
+def _parse_ts(value):
+    return datetime.fromisoformat(value) if value else None
+
+class WatchlistStore:
+    """Copia en memoria de la tabla `watchlist`.
+
+    `backend` es cualquier objeto con las coroutines de utils/repository.py para
+    el watchlist (get_watchlist_changes, add_anime, add_animes, mark_watched,
+    delete_anime), así que se puede probar con uno falso en memoria.
+    """
+
+    def __init__(self, backend, sqlite_path=None):
+        self._backend = backend
+        self._rows = {}
+        self._titles = NgramIndex()
+        self._keys = {}  # title_key -> {ids}
+        self._version = 0
+        self._sorted = {}  # status -> (versión, ids ordenados)
+        self._watermark = None
+        self._refreshes = 0
+        self._lock = asyncio.Lock()
+        self._sqlite_path = sqlite_path
+        self._db = None
+        self.loaded = False
+
+    # --- SINCRONIZACIÓN ---
+    async def load(self):
+        if self._sqlite_path:
+            rows, watermark = await asyncio.to_thread(self._open_sqlite)
+            self._apply(rows, ())
+            self._watermark = watermark
+        if self._rows:
+            # La copia en disco ya es una réplica completa (aunque atrasada): se puede servir
+            self.loaded = True
+            # Arranque rápido desde disco y después solo lo que cambió
+            await self.refresh()
+        else:
+            await self.resync()
+        self.loaded = True
+
+    async def resync(self):
+        async with self._lock:
+            rows = await self._backend.get_watchlist_changes(None)
+            self._rows = {}
+            self._titles = NgramIndex()
+            self._keys = {}
+            self._watermark = None
+            self._apply(rows, ())
+            await self._persist(rebuild=True)
+
+    async def refresh(self):
+        self._refreshes += 1
+        if self._refreshes % FULL_SYNC_EVERY == 0:
+            return await self.resync()
+        async with self._lock:
+            # gte y no gt: reaplicar una fila es inofensivo y no perdemos empates
+            rows = await self._backend.get_watchlist_changes(self._watermark)
+            self._apply(rows, ())
+            await self._persist(rows)
+
+    async def apply_changes(self, upserts=(), deleted_ids=()):
+        """Punto de entrada para un feed de cambios externo (p. ej. Supabase Realtime)."""
+        async with self._lock:
+            self._apply(upserts, deleted_ids)
+            await self._persist(upserts, deleted_ids)
+
+    def _require_loaded(self):
+        # Sin la carga inicial la réplica está vacía: "no disponible" en vez de "¡Todo al día!"
+        # y en vez de importar duplicados que no se pueden detectar
+        if not self.loaded:
+            raise repository.DatabaseUnavailable(repository.breaker.retry_after())
+
+    def _apply(self, upserts, deleted_ids):
+        self._version += 1
+        for row in upserts:
+            self._unindex(row['id'])
+            self._rows[row['id']] = row
+            self._titles.add(row['id'], row['title'])
+            self._keys.setdefault(title_key(row['title']), set()).add(row['id'])
+            ts = row.get('updated_at')
+            if ts and (self._watermark is None or _parse_ts(ts) > _parse_ts(self._watermark)):
+                self._watermark = ts
+        for row_id in deleted_ids:
+            self._unindex(row_id)
+            self._rows.pop(row_id, None)
+            self._titles.remove(row_id)
+
+    def _unindex(self, row_id):
+        old = self._rows.get(row_id)
+        if old is not None:
+            key = title_key(old['title'])
+            ids = self._keys.get(key)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del self._keys[key]
+
+    # --- LECTURAS (memoria) ---
+    def _sorted_ids(self, status: bool):
+        cached = self._sorted.get(status)
+        if cached is None or cached[0] != self._version:
+            ids = sorted(i for i, r in self._rows.items() if r['status'] == status)
+            cached = self._sorted[status] = (self._version, ids)
+        return cached[1]
+
+    def list(self, status: bool):
+        self._require_loaded()
+        return [self._rows[i] for i in self._sorted_ids(status)]
+
+    def count(self, status: bool):
+        self._require_loaded()
+        return len(self._sorted_ids(status))
+
+    def page(self, status: bool, after=None, before=None, limit: int = 5):
+        """Página por keyset sobre el id: la siguiente a `after` o la anterior a `before`."""
+        self._require_loaded()
+        ids = self._sorted_ids(status)
+        if before is not None:
+            end = bisect.bisect_left(ids, before)
+            start = max(0, end - limit)
+        else:
+            start = bisect.bisect_right(ids, after) if after is not None else 0
+            end = start + limit
+        return [self._rows[i] for i in ids[start:end]]
+
+    def search(self, query: str, status: bool = None, limit: int = 25):
+        self._require_loaded()
+        where = None
+        if status is not None:
+            where = lambda i: self._rows[i]['status'] == status
+        return [self._rows[i] for i in self._titles.search(query, limit, where)]
+
+    def resolve(self, text: str, status: bool = None):
+        """Fila a la que se refiere `text`: el id del autocompletado (`id:86`) o el mismo título normalizado."""
+        self._require_loaded()
+        text = text.strip()
+        if text.startswith(ID_PREFIX) and text[len(ID_PREFIX):].isdigit():
+            row = self._rows.get(int(text[len(ID_PREFIX):]))
+            if row is not None and (status is None or row['status'] == status):
+                return row
+        for row_id in sorted(self._keys.get(title_key(text), ())):
+            if status is None or self._rows[row_id]['status'] == status:
+                return self._rows[row_id]
+        return None
+
+    def contains(self, title: str):
+        self._require_loaded()
+        return title_key(title) in self._keys
+
+    # --- ESCRITURAS (write-through) ---
+    async def add(self, title: str, added_by: str):
+        self._require_loaded()
+        rows = await self._backend.add_anime(title, added_by)
+        await self.apply_changes(rows)
+        return rows
+
+    async def add_many(self, entries, added_by: str, chunk_size: int = IMPORT_CHUNK_SIZE):
+        """Importa [(título, visto), ...] saltando los que ya están; un insert por bloque."""
+        self._require_loaded()
+        seen = set()
+        rows = []
+        for title, watched in entries:
+            key = title_key(title)
+            if key in self._keys or key in seen:
+                continue
+            seen.add(key)
+            rows.append({"title": title, "added_by": added_by, "status": watched})
+
+        inserted = []
+        for i in range(0, len(rows), chunk_size):
+            chunk = await self._backend.add_animes(rows[i:i + chunk_size])
+            await self.apply_changes(chunk)
+            inserted.extend(chunk)
+        return inserted
+
+    async def mark_watched(self, row_id: int):
+        self._require_loaded()
+        rows = await self._backend.mark_watched(row_id)
+        await self.apply_changes(rows)
+        return rows
+
+    async def delete(self, row_id: int):
+        self._require_loaded()
+        rows = await self._backend.delete_anime(row_id)
+        await self.apply_changes(deleted_ids=[r['id'] for r in rows])
+        return rows
+
+    # --- PERSISTENCIA LOCAL (opcional) ---
+    def _open_sqlite(self):
+        self._db = sqlite3.connect(self._sqlite_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS watchlist (id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+        rows = [json.loads(data) for (data,) in self._db.execute("SELECT data FROM watchlist")]
+        meta = self._db.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+        return rows, meta[0] if meta else None
+
+    async def _persist(self, upserts=(), deleted_ids=(), rebuild=False):
+        if self._db is None:
+            return
+        if rebuild:
+            upserts = list(self._rows.values())
+        await asyncio.to_thread(self._write_sqlite, list(upserts), list(deleted_ids), rebuild, self._watermark)
+
+    def _write_sqlite(self, upserts, deleted_ids, rebuild, watermark):
+        with self._db:
+            if rebuild:
+                self._db.execute("DELETE FROM watchlist")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO watchlist (id, data) VALUES (?, ?)",
+                [(r['id'], json.dumps(r)) for r in upserts]
+            )
+            self._db.executemany("DELETE FROM watchlist WHERE id = ?", [(i,) for i in deleted_ids])
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('watermark', ?)", (watermark,))
+
+watchlist = WatchlistStore(repository, WATCHLIST_SQLITE_PATH)
@@ -0,0 +1,74 @@
+-- Registra un intento de Unitedle en una sola llamada atómica.
+-- Reemplaza el "contar intentos y luego insertar" del cliente, que con dos
+-- envíos rápidos podía repetir el mismo attempt_number.
+
+-- Ese flujo ya dejó attempt_numbers repetidos: se renumeran 1..n por usuario y
+-- día (en el orden en que se registraron) antes de crear el índice único.
+-- Solo se tocan los grupos con repetidos, así que volver a correrlo no cambia nada.
+with duplicated as (
+    select user_id, date
+      from public.user_attempts
+     group by user_id, date
+    having count(*) <> count(distinct attempt_number)
+), renumbered as (
+    select ua.ctid as row_ctid,
+           row_number() over (partition by ua.user_id, ua.date order by ua.attempt_number, ua.ctid) as n
+      from public.user_attempts ua
+      join duplicated d on d.user_id = ua.user_id and d.date = ua.date
+)
+update public.user_attempts ua
+   set attempt_number = r.n
+  from renumbered r
+ where ua.ctid = r.row_ctid
+   and ua.attempt_number <> r.n;
+
+create unique index if not exists user_attempts_user_date_attempt_key
+    on public.user_attempts (user_id, date, attempt_number);
+
+-- p_feedback toma el tipo real de result_json (text o jsonb): el bot manda el
+-- patrón de emojis como string y así se guarda igual que con el insert directo.
+-- La versión anterior de esta función recibía jsonb; se borra para no dejar dos sobrecargas.
+drop function if exists public.submit_unitedle_guess(bigint, date, text, text, jsonb);
+
+create or replace function public.submit_unitedle_guess(
+    p_user_id bigint,
+    p_date date,
+    p_guess text,
+    p_target text,
+    p_feedback public.user_attempts.result_json%type
+)
+returns table (attempt_number int, won boolean, already_won boolean, hint_level int)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+    v_attempt int;
+begin
+    -- Serializa los intentos del mismo usuario en el mismo día
+    perform pg_advisory_xact_lock(hashtextextended(p_user_id::text || ':' || p_date::text, 0));
+
+    select coalesce(max(ua.attempt_number), 0)
+      into v_attempt
+      from public.user_attempts ua
+     where ua.user_id = p_user_id
+       and ua.date = p_date;
+
+    if exists (
+        select 1
+          from public.user_attempts ua
+         where ua.user_id = p_user_id
+           and ua.date = p_date
+           and ua.guess = p_target
+    ) then
+        return query select v_attempt, true, true, least(v_attempt / 3, 3);
+        return;
+    end if;
+
+    v_attempt := v_attempt + 1;
+
+    insert into public.user_attempts (user_id, date, attempt_number, guess, result_json)
+    values (p_user_id, p_date, v_attempt, p_guess, p_feedback);
+
+    return query select v_attempt, p_guess = p_target, false, least(v_attempt / 3, 3);
+end;
+$$;
@@ -0,0 +1,165 @@
+-- Agregados por usuario de Unitedle, actualizados en cada intento por
+-- submit_unitedle_guess en la misma llamada que lo registra.
+-- Evita recorrer user_attempts para mostrar rachas, winrate o el leaderboard.
+
+create table if not exists public.unitedle_stats (
+    user_id bigint primary key,
+    played int not null default 0,
+    wins int not null default 0,
+    current_streak int not null default 0,
+    best_streak int not null default 0,
+    last_played_date date,
+    last_win_date date,
+    histogram jsonb not null default '{}'::jsonb,
+    updated_at timestamptz not null default now()
+);
+
+create index if not exists unitedle_stats_ranking_idx
+    on public.unitedle_stats (wins desc, best_streak desc);
+
+-- Relleno inicial desde el historial, para que quien jugó antes de esta
+-- migración aparezca en /unitedle stats y en el leaderboard. Un día cuenta como
+-- ganado si algún intento es el nombre (en mayúsculas, como lo guarda el bot)
+-- del Pokémon de ese día. Las rachas son tramos de días ganados consecutivos.
+-- No pisa filas existentes, así que volver a correrlo no cambia nada.
+with days as (
+    select ua.user_id,
+           ua.date,
+           min(ua.attempt_number) filter (where ua.guess = upper(pu.name)) as win_attempt
+      from public.user_attempts ua
+      left join public.daily_pokemon dp on dp.date = ua.date
+      left join public.pokemon_unite pu on pu.id = dp.pokemon_id
+     group by ua.user_id, ua.date
+), streaks as (
+    select user_id, count(*) as length, max(date) as last_date
+      from (
+          select user_id, date,
+                 date - (row_number() over (partition by user_id order by date))::int as island
+            from days
+           where win_attempt is not null
+      ) won
+     group by user_id, island
+), histograms as (
+    select user_id, jsonb_object_agg(win_attempt::text, n) as histogram
+      from (
+          select user_id, win_attempt, count(*) as n
+            from days
+           where win_attempt is not null
+           group by user_id, win_attempt
+      ) h
+     group by user_id
+)
+insert into public.unitedle_stats
+    (user_id, played, wins, current_streak, best_streak, last_played_date, last_win_date, histogram)
+select d.user_id,
+       count(*),
+       count(d.win_attempt),
+       coalesce((select s.length from streaks s where s.user_id = d.user_id order by s.last_date desc limit 1), 0),
+       coalesce((select max(s.length) from streaks s where s.user_id = d.user_id), 0),
+       max(d.date),
+       max(d.date) filter (where d.win_attempt is not null),
+       coalesce((select h.histogram from histograms h where h.user_id = d.user_id), '{}'::jsonb)
+  from days d
+ group by d.user_id
+on conflict (user_id) do nothing;
+
+-- Suma un intento a los agregados del usuario y devuelve la fila actualizada.
+create or replace function public.record_unitedle_stats(
+    p_user_id bigint,
+    p_date date,
+    p_attempt int,
+    p_won boolean
+)
+returns public.unitedle_stats
+language plpgsql
+as $$
+declare
+    s public.unitedle_stats;
+begin
+    insert into public.unitedle_stats (user_id) values (p_user_id)
+    on conflict (user_id) do nothing;
+
+    select * into s from public.unitedle_stats where user_id = p_user_id for update;
+
+    if s.last_played_date is distinct from p_date then
+        s.played := s.played + 1;
+        s.last_played_date := p_date;
+    end if;
+
+    if p_won and s.last_win_date is distinct from p_date then
+        s.current_streak := case when s.last_win_date = p_date - 1 then s.current_streak + 1 else 1 end;
+        s.best_streak := greatest(s.best_streak, s.current_streak);
+        s.last_win_date := p_date;
+        s.wins := s.wins + 1;
+        s.histogram := s.histogram || jsonb_build_object(
+            p_attempt::text, coalesce((s.histogram ->> p_attempt::text)::int, 0) + 1
+        );
+    end if;
+
+    update public.unitedle_stats
+       set played = s.played,
+           wins = s.wins,
+           current_streak = s.current_streak,
+           best_streak = s.best_streak,
+           last_played_date = s.last_played_date,
+           last_win_date = s.last_win_date,
+           histogram = s.histogram,
+           updated_at = now()
+     where user_id = p_user_id
+    returning * into s;
+
+    return s;
+end;
+$$;
+
+-- Misma función que en *_submit_unitedle_guess.sql, ahora también actualiza
+-- unitedle_stats y devuelve la fila en `stats`: un intento sigue siendo un solo viaje.
+-- Cambia el tipo de retorno, así que hay que borrarla antes.
+drop function if exists public.submit_unitedle_guess(bigint, date, text, text, public.user_attempts.result_json%type);
+
+create function public.submit_unitedle_guess(
+    p_user_id bigint,
+    p_date date,
+    p_guess text,
+    p_target text,
+    p_feedback public.user_attempts.result_json%type
+)
+returns table (attempt_number int, won boolean, already_won boolean, hint_level int, stats jsonb)
+language plpgsql
+as $$
+#variable_conflict use_column
+declare
+    v_attempt int;
+    v_won boolean;
+begin
+    -- Serializa los intentos del mismo usuario en el mismo día
+    perform pg_advisory_xact_lock(hashtextextended(p_user_id::text || ':' || p_date::text, 0));
+
+    select coalesce(max(ua.attempt_number), 0)
+      into v_attempt
+      from public.user_attempts ua
+     where ua.user_id = p_user_id
+       and ua.date = p_date;
+
+    if exists (
+        select 1
+          from public.user_attempts ua
+         where ua.user_id = p_user_id
+           and ua.date = p_date
+           and ua.guess = p_target
+    ) then
+        return query select v_attempt, true, true, least(v_attempt / 3, 3), null::jsonb;
+        return;
+    end if;
+
+    v_attempt := v_attempt + 1;
+    v_won := p_guess = p_target;
+
+    insert into public.user_attempts (user_id, date, attempt_number, guess, result_json)
+    values (p_user_id, p_date, v_attempt, p_guess, p_feedback);
+
+    return query
+        select v_attempt, v_won, false, least(v_attempt / 3, 3),
+               to_jsonb(public.record_unitedle_stats(p_user_id, p_date, v_attempt, v_won));
+end;
+$$;
@@ -0,0 +1,5 @@
+-- Una sola fila por día: el planificador del bot inserta con ON CONFLICT DO NOTHING,
+-- así que varios procesos (o reinicios) pueden rellenar la ventana sin duplicar días.
+
+create unique index if not exists daily_pokemon_date_key
+    on public.daily_pokemon (date);
@@ -0,0 +1,23 @@
+-- Marca de agua para la réplica local del watchlist: el bot solo pide las
+-- filas con updated_at >= la última que ya vio.
+
+alter table public.watchlist
+    add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists watchlist_updated_at_idx
+    on public.watchlist (updated_at);
+
+create or replace function public.touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists watchlist_touch_updated_at on public.watchlist;
+create trigger watchlist_touch_updated_at
+    before update on public.watchlist
+    for each row execute function public.touch_updated_at();